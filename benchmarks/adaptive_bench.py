@@ -0,0 +1,113 @@
+'''
+storage='auto' against every hand-picked backend, per workload.  Each
+workload is run on a plain list, on AdaptiveStorage pinned to each of its
+backends and on AdaptiveStorage left to choose.  Times include building
+the collection, so a pinned index pays for itself as auto does, and
+every backend is run once per round in process time, those more than
+twice as slow as the fastest only in the first.  The ratio is the median
+over rounds of auto against the fastest hand-picked backend, and auto
+passes when it is within the tolerance
+
+    PYTHONPATH=src python benchmarks/adaptive_bench.py
+        [--size 10000] [--repeat 20] [--tolerance 0.1]
+
+from the repository root, or without PYTHONPATH once dotlist is
+installed
+'''
+
+import argparse
+import gc
+import random
+from statistics import median
+import time
+
+from dotlist import AdaptiveStorage, dotlist
+
+
+def queue(collection: dotlist, size: int) -> None:
+    for x in range(size):
+        collection.add(x)
+        collection.shave_first()
+
+
+def membership(collection: dotlist, size: int) -> None:
+    rng = random.Random(1)
+    for x in range(size):
+        collection.has(rng.randrange(2 * size))
+        if x % 50 == 0:
+            collection.add(x)
+
+
+def aggregate(collection: dotlist, size: int) -> None:
+    for _ in range(200):
+        collection.sum()
+        collection.max()
+
+
+def mixed(collection: dotlist, size: int) -> None:
+    rng = random.Random(2)
+    for x in range(size):
+        roll = rng.random()
+        if roll < 0.4:
+            collection.add(x)
+            collection.shave_first()
+        elif roll < 0.8:
+            collection.has(rng.randrange(2 * size))
+        elif roll < 0.99:
+            collection.at(rng.randrange(size))
+        else:
+            collection.sum()
+
+
+workloads = dict(queue=queue, membership=membership, aggregate=aggregate,
+                 mixed=mixed)
+backends = ('list', 'deque', 'array', 'list+index', 'deque+index')
+
+
+def timed(workload, builders: dict, size: int, repeat: int) -> dict:
+    times = {x: list() for x in builders}
+    for _ in range(repeat):
+        for name, build in builders.items():
+            data = list(range(size))
+            gc.collect()
+            started = time.process_time()
+            workload(build(data), size)
+            times[name].append(time.process_time() - started)
+
+        fastest = min(min(x) for x in times.values() if x)
+        builders = {x: y for x, y in builders.items()
+                    if x == 'auto' or min(times[x]) < 2 * fastest}
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    args = parser.parse_args()
+
+    builders = {'plain': dotlist}
+    for backend in backends:
+        builders[backend] = lambda data, backend=backend: dotlist(
+            AdaptiveStorage(data, backend=backend))
+    builders['auto'] = lambda data: dotlist(data, storage='auto')
+
+    failed = False
+    print(f'{"workload":>10} {"best":>12} {"best s":>9} {"auto s":>9} '
+          f'{"ratio":>6}')
+    for name, workload in workloads.items():
+        times = timed(workload, builders, args.size, args.repeat)
+        auto = times.pop('auto')
+        best = min(times, key=lambda x: min(times[x]))
+        ratio = median(x / y for x, y in zip(auto, times[best]))
+        failed |= ratio > 1 + args.tolerance
+        print(f'{name:>10} {best:>12} {min(times[best]):>9.4f} '
+              f'{min(auto):>9.4f} {ratio:>6.2f}'
+              f'{"" if ratio <= 1 + args.tolerance else "  FAIL"}')
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+'''
+Bitmap storage against the list path for integer id sets of 1e6 to 1e8
+elements.  The list path intersects and differences by scanning the
+collection for every compared element, so at these sizes it is timed
+over a sample of probes and extrapolated, marked with ~
+
+    PYTHONPATH=src python benchmarks/bitmap_bench.py
+        [--sizes 1e6 1e7 1e8] [--list-limit 1e7] [--probes 20]
+
+from the repository root, or without PYTHONPATH once dotlist is
+installed.  Building 1e8 ids takes several minutes and a few GB of
+memory
+'''
+
+import argparse
+import time
+
+from dotlist import BitmapStorage, RoaringBitmap, dotlist
+
+
+def timed(func) -> tuple:
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def build(values: range, chunk: int = 1 << 20) -> dotlist:
+    bitmap = RoaringBitmap()
+    for start in range(0, len(values), chunk):
+        bitmap.update(values[start: start + chunk])
+    return dotlist(BitmapStorage(bitmap))
+
+
+def run(size: int, list_limit: int, probes: int) -> dict:
+    evens = range(0, 2 * size, 2)
+    threes = range(0, 3 * size, 3)
+    results = dict()
+
+    results['build'], left = timed(lambda: build(evens))
+    right = build(threes)
+    results['has'] = timed(
+        lambda: [left.has(x) for x in threes[:probes * 1000]])[0] / 1000
+    results['intersection'] = timed(lambda: left.intersection(right))[0]
+    results['union'] = timed(lambda: left.clone().union(right))[0]
+    results['difference'] = timed(lambda: left.difference(right))[0]
+    results['count_distinct'] = timed(left.count_distinct)[0]
+    results['to_bytes'] = timed(left._collection.bitmap.to_bytes)[0]
+
+    if size > list_limit:
+        return {x: (y, None) for x, y in results.items()}
+
+    baseline = dict()
+    plain = dotlist(list(evens))
+    compare = list(threes)
+    baseline['build'] = timed(lambda: dotlist(list(evens)))[0]
+    probe = timed(lambda: [plain.has(x) for x in compare[:probes]])[0] \
+        / probes
+    baseline['has'] = probe * probes
+    baseline['intersection'] = probe * len(compare)
+    baseline['union'] = timed(lambda: plain.clone().union(compare))[0]
+    baseline['difference'] = probe * len(compare)
+    baseline['count_distinct'] = timed(plain.count_distinct)[0]
+    baseline['to_bytes'] = None
+    return {x: (y, baseline[x]) for x, y in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', type=float,
+                        default=[1e6, 1e7, 1e8])
+    parser.add_argument('--list-limit', type=float, default=1e7)
+    parser.add_argument('--probes', type=int, default=20)
+    args = parser.parse_args()
+
+    estimated = ('has', 'intersection', 'difference')
+    print(f'{"size":>6} {"operation":>15} {"bitmap s":>12} {"list s":>14}')
+    for size in map(int, args.sizes):
+        for operation, (bitmap, plain) in run(
+                size, int(args.list_limit), args.probes).items():
+            if plain is None:
+                listed = '-'
+            else:
+                mark = '~' if operation in estimated else ''
+                listed = f'{mark}{plain:.4f}'
+            print(f'{size:>6.0e} {operation:>15} {bitmap:>12.4f} '
+                  f'{listed:>14}')
+
+
+if __name__ == '__main__':
+    main()
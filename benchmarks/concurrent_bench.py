@@ -0,0 +1,69 @@
+'''
+Throughput of concurrent_dotlist as writer threads scale from 1 to 32,
+with reader threads summing snapshots alongside
+
+    PYTHONPATH=src python benchmarks/concurrent_bench.py
+        [--adds 200000] [--readers 2]
+
+from the repository root, or without PYTHONPATH once dotlist is
+installed
+'''
+
+import argparse
+import threading
+import time
+
+from dotlist import concurrent_dotlist
+
+
+def run(writers: int, adds: int, readers: int, batch_size: int) -> tuple:
+    collection = concurrent_dotlist(batch_size=batch_size)
+    per_writer = adds // writers
+    done = threading.Event()
+    reads = [0] * readers
+
+    def write():
+        for index in range(per_writer):
+            collection.add(index)
+
+    def read(slot):
+        while not done.is_set():
+            collection.sum()
+            reads[slot] += 1
+
+    reading = [threading.Thread(target=read, args=(x,))
+               for x in range(readers)]
+    writing = [threading.Thread(target=write) for _ in range(writers)]
+
+    for thread in reading:
+        thread.start()
+    started = time.perf_counter()
+    for thread in writing:
+        thread.start()
+    for thread in writing:
+        thread.join()
+    collection.flush()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for thread in reading:
+        thread.join()
+
+    assert collection.count == per_writer * writers
+    return per_writer * writers / elapsed, sum(reads) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--adds', type=int, default=200000)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    print(f'{"writers":>8} {"adds/s":>12} {"reads/s":>10}')
+    for writers in (1, 2, 4, 8, 16, 32):
+        adds, reads = run(writers, args.adds, args.readers, args.batch_size)
+        print(f'{writers:>8} {adds:>12,.0f} {reads:>10,.1f}')
+
+
+if __name__ == '__main__':
+    main()
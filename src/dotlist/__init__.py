@@ -1 +1,10 @@
 from dotlist.collections import dotlist
+from dotlist.approximate import BloomFilter, HyperLogLog
+from dotlist.bitmap import BitmapStorage, RoaringBitmap
+from dotlist.storage import (
+    AdaptiveStorage, CategoricalStorage, ColumnarStorage, LazyStorage,
+    Storage)
+from dotlist.persistent import PersistentStorage
+from dotlist.concurrent import concurrent_dotlist
+from dotlist.views import dotlist_view
+from dotlist.sharded import sharded_dotlist
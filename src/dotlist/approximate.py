@@ -0,0 +1,335 @@
+from collections.abc import Iterable
+from decimal import Decimal
+from fractions import Fraction
+from hashlib import blake2b
+from math import ceil, exp, inf, log, sqrt
+from numbers import Complex, Real
+import struct
+
+
+def _number(obj) -> bytes:
+    if isinstance(obj, int):
+        return b'i' + str(int(obj)).encode()
+    try:
+        ratio = Fraction(obj)
+    except (TypeError, ValueError, OverflowError):
+        return b'f' + repr(float(obj)).encode()
+    if ratio.denominator == 1:
+        return b'i' + str(ratio.numerator).encode()
+    return b'q' + f'{ratio.numerator}/{ratio.denominator}'.encode()
+
+
+def _canonical(obj) -> bytes:
+    '''
+    Encode an element to bytes such that elements that compare equal
+    encode equally.  Strings, bytes, numbers and tuples of them encode
+    by value and are stable across processes, with numbers of any type
+    encoded by their exact value; any other hashable object falls back
+    to its (process local) hash
+    '''
+
+    if obj is None:
+        return b'n'
+    if isinstance(obj, str):
+        return b's' + obj.encode('utf-8', 'surrogatepass')
+    if isinstance(obj, bytes):
+        return b'b' + obj
+    if isinstance(obj, Complex) and not isinstance(obj, Real):
+        if obj.imag:
+            return b'c' + _canonical((obj.real, obj.imag))
+        obj = obj.real
+    if isinstance(obj, (Real, Decimal)):
+        return _number(obj)
+    if isinstance(obj, tuple):
+        parts = [_canonical(x) for x in obj]
+        return b't' + b''.join(
+            struct.pack('>I', len(x)) + x for x in parts)
+
+    return b'h' + str(hash(obj)).encode()
+
+
+def _stable_hash(obj, size: int = 8) -> int:
+    return int.from_bytes(
+        blake2b(_canonical(obj), digest_size=size).digest(), 'big')
+
+
+def _sigma(x: float) -> float:
+    if x == 1:
+        return inf
+
+    power, total = 1.0, x
+    while True:
+        x *= x
+        previous = total
+        total += x * power
+        power += power
+        if total == previous:
+            return total
+
+
+def _tau(x: float) -> float:
+    if x == 0 or x == 1:
+        return 0.0
+
+    power, total = 1.0, 1 - x
+    while True:
+        x = sqrt(x)
+        previous = total
+        power *= 0.5
+        total -= (1 - x) ** 2 * power
+        if total == previous:
+            return total / 3
+
+
+class HyperLogLog:
+    '''
+    Approximate distinct counter.  Memory is fixed at 2^precision
+    registers and the standard error of the estimate is
+    1.04 / sqrt(2^precision).  Counts are estimated from the histogram
+    of register values (Ertl, 2017), which stays unbiased through the
+    small and intermediate ranges where the raw HyperLogLog estimate
+    needs empirical correction
+    '''
+
+    min_precision = 4
+    max_precision = 18
+
+    def __init__(self, precision: int = 14):
+        if not self.min_precision <= precision <= self.max_precision:
+            raise ValueError(
+                f'Precision must be between {self.min_precision} '
+                f'and {self.max_precision}')
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def __len__(self):
+        return self.count()
+
+    @property
+    def error(self) -> float:
+        '''
+        The relative standard error of the estimate
+        '''
+
+        return 1.04 / sqrt(len(self._registers))
+
+    def add(self, obj: object) -> None:
+        '''
+        Add an element to the counter
+
+        Parameters:
+            obj (object): the element to count
+        '''
+
+        width = 64 - self.precision
+        hashed = _stable_hash(obj)
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, obj: Iterable) -> None:
+        '''
+        Add every element of an iterable to the counter
+
+        Parameters:
+            obj (iterable): the elements to count
+        '''
+
+        for element in obj:
+            self.add(element)
+
+    def count(self) -> int:
+        '''
+        Gets the estimated count of distinct elements
+
+        Returns:
+            count (int): the estimated distinct count
+        '''
+
+        registers = len(self._registers)
+        width = 64 - self.precision
+        histogram = [0] * (width + 2)
+        for register in self._registers:
+            histogram[register] += 1
+
+        estimate = registers * _tau(
+            1 - histogram[width + 1] / registers)
+        for rank in range(width, 0, -1):
+            estimate = 0.5 * (estimate + histogram[rank])
+        estimate += registers * _sigma(histogram[0] / registers)
+
+        return int(round(
+            registers * registers / (2 * log(2) * estimate)))
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        '''
+        Merge another counter into this one in place.  The merged
+        counter estimates the distinct count of the union of both
+
+        Parameters:
+            other (HyperLogLog): a counter of the same precision
+        '''
+
+        if other.precision != self.precision:
+            raise ValueError(
+                'Cannot merge counters of different precision')
+
+        self._registers = bytearray(
+            map(max, self._registers, other._registers))
+
+    def to_bytes(self) -> bytes:
+        '''
+        Serialize the counter
+
+        Returns:
+            data (bytes): the serialized counter
+        '''
+
+        return bytes([self.precision]) + bytes(self._registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        '''
+        Deserialize a counter produced by to_bytes
+
+        Parameters:
+            data (bytes): the serialized counter
+
+        Returns:
+            counter (HyperLogLog): the deserialized counter
+        '''
+
+        counter = cls(data[0])
+        if len(data) - 1 != len(counter._registers):
+            raise ValueError('Serialized counter is truncated')
+
+        counter._registers = bytearray(data[1:])
+        return counter
+
+
+class BloomFilter:
+    '''
+    Probabilistic membership filter.  Lookups never return false
+    negatives, and return false positives at roughly error_rate
+    while no more than capacity elements have been added
+    '''
+
+    _header = struct.Struct('>QdQ')
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError('Capacity must be positive')
+        if not 0 < error_rate < 1:
+            raise ValueError('Error rate must be between 0 and 1')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+
+        self._bits = ceil(
+            -capacity * log(error_rate) / (log(2) ** 2))
+        self._hashes = max(
+            1, int(round(self._bits / capacity * log(2))))
+        self._array = bytearray((self._bits + 7) // 8)
+
+    def __contains__(self, obj):
+        for position in self._positions(obj):
+            if not self._array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def _positions(self, obj):
+        hashed = _stable_hash(obj, 16)
+        first, second = hashed >> 64, hashed & 0xFFFFFFFFFFFFFFFF
+        for index in range(self._hashes):
+            yield (first + index * second) % self._bits
+
+    @property
+    def expected_error(self) -> float:
+        '''
+        The expected false positive rate at the current count
+        '''
+
+        return (1 - exp(
+            -self._hashes * self.count / self._bits)) ** self._hashes
+
+    def add(self, obj: object) -> None:
+        '''
+        Add an element to the filter
+
+        Parameters:
+            obj (object): the element to add
+        '''
+
+        for position in self._positions(obj):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, obj: Iterable) -> None:
+        '''
+        Add every element of an iterable to the filter
+
+        Parameters:
+            obj (iterable): the elements to add
+        '''
+
+        for element in obj:
+            self.add(element)
+
+    def merge(self, other: 'BloomFilter') -> None:
+        '''
+        Merge another filter into this one in place.  The merged
+        filter contains the elements of both
+
+        Parameters:
+            other (BloomFilter): a filter of the same capacity and
+            error rate
+        '''
+
+        if (other.capacity, other.error_rate) != (
+                self.capacity, self.error_rate):
+            raise ValueError(
+                'Cannot merge filters of different capacity or error rate')
+
+        merged = int.from_bytes(self._array, 'little') | int.from_bytes(
+            other._array, 'little')
+        self._array = bytearray(
+            merged.to_bytes(len(self._array), 'little'))
+        self.count += other.count
+
+    def to_bytes(self) -> bytes:
+        '''
+        Serialize the filter
+
+        Returns:
+            data (bytes): the serialized filter
+        '''
+
+        return self._header.pack(
+            self.capacity, self.error_rate, self.count) + bytes(self._array)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        '''
+        Deserialize a filter produced by to_bytes
+
+        Parameters:
+            data (bytes): the serialized filter
+
+        Returns:
+            filter (BloomFilter): the deserialized filter
+        '''
+
+        capacity, error_rate, count = cls._header.unpack_from(data)
+        bloom = cls(capacity, error_rate)
+        if len(data) - cls._header.size != len(bloom._array):
+            raise ValueError('Serialized filter is truncated')
+
+        bloom._array = bytearray(data[cls._header.size:])
+        bloom.count = count
+        return bloom
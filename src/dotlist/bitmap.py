@@ -0,0 +1,708 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from itertools import groupby
+import struct
+import sys
+
+from dotlist.storage import Storage
+
+
+_block_bits = 16
+_block_mask = (1 << _block_bits) - 1
+_bitmap_bytes = (1 << _block_bits) // 8
+_array_limit = 4096
+
+_byte_bits = [tuple(x for x in range(8) if value >> x & 1)
+              for value in range(256)]
+
+
+def _popcount(bits: int) -> int:
+    if hasattr(bits, 'bit_count'):
+        return bits.bit_count()
+    return bin(bits).count('1')
+
+
+def _pack_shorts(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array('H', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack_shorts(data: bytes) -> array:
+    values = array('H')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class _ArrayContainer:
+    '''
+    Sorted array of the low 16 bits of up to 4096 values
+    '''
+
+    __slots__ = ('values',)
+    kind = 0
+
+    def __init__(self, values: Iterable = ()):
+        self.values = array('H', values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __contains__(self, value):
+        index = bisect_left(self.values, value)
+        return index < len(self.values) and self.values[index] == value
+
+    def add(self, value: int):
+        index = bisect_left(self.values, value)
+        if index < len(self.values) and self.values[index] == value:
+            return self
+        if len(self.values) >= _array_limit:
+            return _BitmapContainer.from_int(self.to_int() | 1 << value)
+        self.values.insert(index, value)
+        return self
+
+    def discard(self, value: int):
+        index = bisect_left(self.values, value)
+        if index < len(self.values) and self.values[index] == value:
+            del self.values[index]
+        return self
+
+    def select(self, rank: int) -> int:
+        return self.values[rank]
+
+    def rank(self, value: int) -> int:
+        return bisect_right(self.values, value)
+
+    def to_int(self) -> int:
+        bits = bytearray(_bitmap_bytes)
+        for value in self.values:
+            bits[value >> 3] |= 1 << (value & 7)
+        return int.from_bytes(bits, 'little')
+
+    def to_bytes(self) -> bytes:
+        return _pack_shorts(self.values)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> '_ArrayContainer':
+        container = cls()
+        container.values = _unpack_shorts(data)
+        return container
+
+
+class _BitmapContainer:
+    '''
+    Fixed 2^16 bit bitmap for blocks holding more than 4096 values
+    '''
+
+    __slots__ = ('bits', 'cardinality')
+    kind = 1
+
+    def __init__(self):
+        self.bits = bytearray(_bitmap_bytes)
+        self.cardinality = 0
+
+    def __len__(self):
+        return self.cardinality
+
+    def __iter__(self):
+        for index, byte in enumerate(self.bits):
+            if byte:
+                base = index << 3
+                for bit in _byte_bits[byte]:
+                    yield base + bit
+
+    def __contains__(self, value):
+        return bool(self.bits[value >> 3] & 1 << (value & 7))
+
+    def add(self, value: int):
+        if value not in self:
+            self.bits[value >> 3] |= 1 << (value & 7)
+            self.cardinality += 1
+        return self
+
+    def discard(self, value: int):
+        if value in self:
+            self.bits[value >> 3] &= ~(1 << (value & 7)) & 0xFF
+            self.cardinality -= 1
+        if self.cardinality <= _array_limit:
+            return _ArrayContainer(self)
+        return self
+
+    def select(self, rank: int) -> int:
+        for value in self:
+            if not rank:
+                return value
+            rank -= 1
+        raise IndexError('container rank out of range')
+
+    def rank(self, value: int) -> int:
+        return _popcount(self.to_int() & ((2 << value) - 1))
+
+    def to_int(self) -> int:
+        return int.from_bytes(self.bits, 'little')
+
+    @classmethod
+    def from_int(cls, bits: int) -> '_BitmapContainer':
+        container = cls()
+        container.bits = bytearray(bits.to_bytes(_bitmap_bytes, 'little'))
+        container.cardinality = _popcount(bits)
+        return container
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> '_BitmapContainer':
+        return cls.from_int(int.from_bytes(data, 'little'))
+
+
+class _RunContainer:
+    '''
+    Sorted runs of consecutive values, stored as starts and lengths
+    less one.  Runs are read only, adding or removing values converts
+    the container back to an array or bitmap
+    '''
+
+    __slots__ = ('starts', 'lengths')
+    kind = 2
+
+    def __init__(self):
+        self.starts = array('H')
+        self.lengths = array('H')
+
+    def __len__(self):
+        return sum(self.lengths) + len(self.lengths)
+
+    def __iter__(self):
+        for start, length in zip(self.starts, self.lengths):
+            yield from range(start, start + length + 1)
+
+    def __contains__(self, value):
+        index = bisect_right(self.starts, value) - 1
+        return index >= 0 and value <= self.starts[index] + \
+            self.lengths[index]
+
+    def _expand(self):
+        return _from_int(self.to_int())
+
+    def add(self, value: int):
+        if value in self:
+            return self
+        return self._expand().add(value)
+
+    def discard(self, value: int):
+        if value not in self:
+            return self
+        return self._expand().discard(value)
+
+    def select(self, rank: int) -> int:
+        for start, length in zip(self.starts, self.lengths):
+            if rank <= length:
+                return start + rank
+            rank -= length + 1
+        raise IndexError('container rank out of range')
+
+    def rank(self, value: int) -> int:
+        total = 0
+        for start, length in zip(self.starts, self.lengths):
+            if value < start:
+                break
+            total += min(value - start, length) + 1
+        return total
+
+    def to_int(self) -> int:
+        bits = 0
+        for start, length in zip(self.starts, self.lengths):
+            bits |= ((1 << (length + 1)) - 1) << start
+        return bits
+
+    @classmethod
+    def from_values(cls, values: Iterable) -> '_RunContainer':
+        container = cls()
+        for _, run in groupby(enumerate(values), lambda x: x[1] - x[0]):
+            run = [x[1] for x in run]
+            container.starts.append(run[0])
+            container.lengths.append(len(run) - 1)
+        return container
+
+    def to_bytes(self) -> bytes:
+        return _pack_shorts(self.starts) + _pack_shorts(self.lengths)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> '_RunContainer':
+        container = cls()
+        half = len(data) // 2
+        container.starts = _unpack_shorts(data[:half])
+        container.lengths = _unpack_shorts(data[half:])
+        return container
+
+
+_container_types = {
+    x.kind: x for x in (_ArrayContainer, _BitmapContainer, _RunContainer)
+}
+
+
+def _from_int(bits: int):
+    if _popcount(bits) > _array_limit:
+        return _BitmapContainer.from_int(bits)
+
+    values = array('H')
+    for index, byte in enumerate(bits.to_bytes(_bitmap_bytes, 'little')):
+        if byte:
+            base = index << 3
+            values.extend(base + x for x in _byte_bits[byte])
+
+    container = _ArrayContainer()
+    container.values = values
+    return container
+
+
+def _intersect(left, right):
+    if isinstance(left, _ArrayContainer) and \
+            isinstance(right, _ArrayContainer):
+        return _ArrayContainer(sorted(set(left.values) & set(right.values)))
+    if isinstance(right, _ArrayContainer):
+        left, right = right, left
+    if isinstance(left, _ArrayContainer):
+        return _ArrayContainer(x for x in left.values if x in right)
+    return _from_int(left.to_int() & right.to_int())
+
+
+def _difference(left, right):
+    if isinstance(left, _ArrayContainer):
+        return _ArrayContainer(x for x in left.values if x not in right)
+    return _from_int(left.to_int() & ~right.to_int())
+
+
+class RoaringBitmap:
+    '''
+    Compressed set of non-negative integers.  Values are split into
+    blocks of 2^16 by their high bits, and each block is stored as a
+    sorted array, a bitmap or a list of runs, whichever suits its
+    density.  Set operations combine blocks pairwise, using word
+    parallel integer operations on dense blocks
+    '''
+
+    _header = struct.Struct('<4sI')
+    _block_header = struct.Struct('<QBI')
+
+    def __init__(self, values: Iterable = None):
+        self._keys = list()
+        self._containers = list()
+
+        if values is not None:
+            self.update(values)
+
+    def __len__(self):
+        return sum(len(x) for x in self._containers)
+
+    def __iter__(self):
+        for key, container in zip(self._keys, self._containers):
+            base = key << _block_bits
+            for value in container:
+                yield base + value
+
+    def __contains__(self, value):
+        if not isinstance(value, int) or value < 0:
+            return False
+        index = self._find(value >> _block_bits)
+        return index is not None and \
+            value & _block_mask in self._containers[index]
+
+    def __eq__(self, other):
+        return isinstance(other, RoaringBitmap) and \
+            self._keys == other._keys and \
+            all(x.to_int() == y.to_int()
+                for x, y in zip(self._containers, other._containers))
+
+    def __repr__(self):
+        return f'RoaringBitmap({len(self)} values ' \
+            f'in {len(self._keys)} blocks)'
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def _find(self, key: int):
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return None
+
+    def _set(self, keys: list, containers: list) -> 'RoaringBitmap':
+        for key, container in zip(keys, containers):
+            if len(container):
+                self._keys.append(key)
+                self._containers.append(container)
+        return self
+
+    def _validate(self, value) -> None:
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError(f'{value!r} is not an integer')
+        if value < 0:
+            raise ValueError(f'{value!r} is negative')
+
+    def add(self, value: int) -> None:
+        '''
+        Add a value to the set
+
+        Parameters:
+            value (int): a non-negative integer
+        '''
+
+        self._validate(value)
+        key, low = value >> _block_bits, value & _block_mask
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            self._containers[index] = self._containers[index].add(low)
+        else:
+            self._keys.insert(index, key)
+            self._containers.insert(index, _ArrayContainer([low]))
+
+    def update(self, values: Iterable) -> None:
+        '''
+        Add every value of an iterable to the set
+
+        Parameters:
+            values (iterable): non-negative integers
+        '''
+
+        values = sorted(set(values))
+        for value in values[:1] + values[-1:]:
+            self._validate(value)
+
+        for key, block in groupby(values, lambda x: x >> _block_bits):
+            container = _ArrayContainer(x & _block_mask for x in block)
+
+            index = self._find(key)
+            if index is not None:
+                self._containers[index] = _from_int(
+                    self._containers[index].to_int() | container.to_int())
+                continue
+
+            if len(container) > _array_limit:
+                container = _from_int(container.to_int())
+            index = bisect_left(self._keys, key)
+            self._keys.insert(index, key)
+            self._containers.insert(index, container)
+
+    def discard(self, value: int) -> None:
+        '''
+        Remove a value from the set if it is present
+
+        Parameters:
+            value (int): the value to remove
+        '''
+
+        if value not in self:
+            return
+
+        index = self._find(value >> _block_bits)
+        container = self._containers[index].discard(value & _block_mask)
+        if len(container):
+            self._containers[index] = container
+        else:
+            del self._keys[index], self._containers[index]
+
+    def remove(self, value: int) -> None:
+        '''
+        Remove a value from the set
+
+        Parameters:
+            value (int): the value to remove
+        '''
+
+        if value not in self:
+            raise KeyError(value)
+        self.discard(value)
+
+    def select(self, rank: int) -> int:
+        '''
+        Gets the value at the given position in ascending order
+
+        Parameters:
+            rank (int): the position
+
+        Returns:
+            value (int): the value at the position
+        '''
+
+        if rank < 0:
+            rank += len(self)
+        for key, container in zip(self._keys, self._containers):
+            if rank < len(container):
+                return key << _block_bits | container.select(rank)
+            rank -= len(container)
+        raise IndexError('bitmap index out of range')
+
+    def rank(self, value: int) -> int:
+        '''
+        Gets the number of values less than or equal to value
+
+        Parameters:
+            value (int): the value
+
+        Returns:
+            rank (int): the count of values up to value
+        '''
+
+        key = value >> _block_bits
+        total = 0
+        for block, container in zip(self._keys, self._containers):
+            if block < key:
+                total += len(container)
+            elif block == key:
+                total += container.rank(value & _block_mask)
+            else:
+                break
+        return total
+
+    def copy(self) -> 'RoaringBitmap':
+        '''
+        Gets a copy of the set
+
+        Returns:
+            bitmap (RoaringBitmap): the copy
+        '''
+
+        return RoaringBitmap.from_bytes(self.to_bytes())
+
+    def intersection(self, *others: 'RoaringBitmap') -> 'RoaringBitmap':
+        '''
+        Gets the values present in this set and every other set.  Only
+        blocks present in every set are compared
+
+        Parameters:
+            others (RoaringBitmap): the sets to intersect
+
+        Returns:
+            bitmap (RoaringBitmap): the intersection
+        '''
+
+        if not others:
+            return self.copy()
+
+        bitmaps = sorted((self,) + others, key=lambda x: len(x._keys))
+        keys = set(bitmaps[0]._keys)
+        for bitmap in bitmaps[1:]:
+            keys.intersection_update(bitmap._keys)
+
+        result = RoaringBitmap()
+        for key in sorted(keys):
+            containers = [x._containers[x._find(key)] for x in bitmaps]
+            container = containers[0]
+            for other in containers[1:]:
+                container = _intersect(container, other)
+                if not len(container):
+                    break
+            result._set([key], [container])
+        return result
+
+    def union(self, *others: 'RoaringBitmap') -> 'RoaringBitmap':
+        '''
+        Gets the values present in any of the sets.  Blocks sharing a
+        key are combined with a single bitwise or
+
+        Parameters:
+            others (RoaringBitmap): the sets to union
+
+        Returns:
+            bitmap (RoaringBitmap): the union
+        '''
+
+        blocks = dict()
+        for bitmap in (self,) + others:
+            for key, container in zip(bitmap._keys, bitmap._containers):
+                blocks.setdefault(key, list()).append(container)
+
+        result = RoaringBitmap()
+        for key in sorted(blocks):
+            containers = blocks[key]
+            if len(containers) == 1:
+                container = _container_types[containers[0].kind] \
+                    .from_bytes(containers[0].to_bytes())
+            else:
+                bits = 0
+                for container in containers:
+                    bits |= container.to_int()
+                container = _from_int(bits)
+            result._set([key], [container])
+        return result
+
+    def difference(self, *others: 'RoaringBitmap') -> 'RoaringBitmap':
+        '''
+        Gets the values present in this set but in none of the others
+
+        Parameters:
+            others (RoaringBitmap): the sets to subtract
+
+        Returns:
+            bitmap (RoaringBitmap): the difference
+        '''
+
+        result = RoaringBitmap()
+        for key, container in zip(self._keys, self._containers):
+            for other in others:
+                index = other._find(key)
+                if index is not None:
+                    container = _difference(container, other._containers[index])
+                    if not len(container):
+                        break
+            else:
+                container = _container_types[container.kind] \
+                    .from_bytes(container.to_bytes())
+            result._set([key], [container])
+        return result
+
+    def run_optimize(self) -> None:
+        '''
+        Store blocks as runs of consecutive values wherever that takes
+        less space than an array or bitmap
+        '''
+
+        for index, container in enumerate(self._containers):
+            runs = _RunContainer.from_values(container)
+            if len(runs.to_bytes()) < len(container.to_bytes()):
+                self._containers[index] = runs
+
+    def to_bytes(self) -> bytes:
+        '''
+        Serialize the set
+
+        Returns:
+            data (bytes): the serialized set
+        '''
+
+        parts = [self._header.pack(b'RBM1', len(self._keys))]
+        for key, container in zip(self._keys, self._containers):
+            payload = container.to_bytes()
+            parts.append(self._block_header.pack(
+                key, container.kind, len(payload)))
+            parts.append(payload)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'RoaringBitmap':
+        '''
+        Deserialize a set produced by to_bytes
+
+        Parameters:
+            data (bytes): the serialized set
+
+        Returns:
+            bitmap (RoaringBitmap): the deserialized set
+        '''
+
+        magic, blocks = cls._header.unpack_from(data)
+        if magic != b'RBM1':
+            raise ValueError('Data is not a serialized bitmap')
+
+        bitmap = cls()
+        offset = cls._header.size
+        for _ in range(blocks):
+            key, kind, size = cls._block_header.unpack_from(data, offset)
+            offset += cls._block_header.size
+            bitmap._keys.append(key)
+            bitmap._containers.append(
+                _container_types[kind].from_bytes(
+                    bytes(data[offset: offset + size])))
+            offset += size
+        return bitmap
+
+
+class BitmapStorage(Storage):
+    '''
+    Storage for sets of non-negative integers backed by a roaring
+    bitmap.  Elements are kept unique and in ascending order, so
+    inserting places the value in order and duplicates are ignored
+    '''
+
+    def __init__(self, data: Iterable = None):
+        if isinstance(data, BitmapStorage):
+            data = data.bitmap.copy()
+        self.bitmap = data if isinstance(data, RoaringBitmap) \
+            else RoaringBitmap(data)
+
+    def __len__(self):
+        return len(self.bitmap)
+
+    def __iter__(self):
+        return iter(self.bitmap)
+
+    def __contains__(self, value):
+        return value in self.bitmap
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BitmapStorage(list(self)[index])
+        return self.bitmap.select(index)
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, slice):
+            raise TypeError(
+                'Bitmap storage is ordered by value, elements cannot be '
+                'assigned by index')
+
+        items = list(self)
+        items[index] = value
+        self.bitmap = RoaringBitmap(items)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for value in list(self)[index]:
+                self.bitmap.discard(value)
+        else:
+            self.bitmap.discard(self.bitmap.select(index))
+
+    def insert(self, index: int, value) -> None:
+        self.bitmap.add(value)
+
+    def append(self, value) -> None:
+        self.bitmap.add(value)
+
+    def extend(self, values: Iterable) -> None:
+        self.bitmap.update(values)
+
+    def remove(self, value) -> None:
+        if value not in self.bitmap:
+            raise ValueError(f'{value!r} is not in storage')
+        self.bitmap.discard(value)
+
+    def index(self, value, *args) -> int:
+        if value not in self.bitmap:
+            raise ValueError(f'{value!r} is not in storage')
+        return self.bitmap.rank(value) - 1
+
+    def count(self, value) -> int:
+        return int(value in self.bitmap)
+
+    def numeric(self) -> bool:
+        return True
+
+    def reverse(self) -> None:
+        raise TypeError('Bitmap storage is always in ascending order')
+
+    def sort(self, reverse: bool = False) -> None:
+        if reverse:
+            self.reverse()
+
+    def copy(self) -> 'BitmapStorage':
+        return BitmapStorage(self.bitmap.copy())
+
+    def distinct(self) -> 'BitmapStorage':
+        return self.copy()
+
+    def count_distinct(self) -> int:
+        return len(self.bitmap)
@@ -1,7 +1,24 @@
-from functools import wraps
+from functools import partial, reduce, wraps
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
+from itertools import accumulate, chain
 from typing import Union, NewType, Callable
+from dotlist.approximate import BloomFilter, HyperLogLog
+from dotlist.bitmap import BitmapStorage, RoaringBitmap
+from dotlist.persistent import PersistentStorage, diff
+from dotlist.storage import (
+    AdaptiveStorage, CategoricalStorage, ColumnarStorage, LazyStorage,
+    Storage)
+import operator
+import os
+
+
+_missing = object()
+
+
+def _reduce_chunk(func: Callable, chunk: list) -> object:
+    return reduce(func, chunk)
 
 
 def update(func):
@@ -14,7 +31,7 @@ def update(func):
 
 class DotListException(Exception):
     def __init__(self, message):
-        super().__init__(self, message=message)
+        super().__init__(message)
 
 
 class JoinType(Enum):
@@ -25,13 +42,40 @@ class JoinType(Enum):
 join_types = NewType('JoinType', JoinType)
 
 
+class Mutation(Enum):
+    Insert = 'insert'
+    Remove = 'remove'
+    Set = 'set'
+    Reset = 'reset'
+
+storage_types = {
+    'auto': AdaptiveStorage,
+    'bitmap': BitmapStorage,
+    'categorical': CategoricalStorage,
+    'columnar': ColumnarStorage,
+    'persistent': PersistentStorage
+}
+
+
 class dotlist:
-    def __init__(self, _list=None):
+    def __init__(self, _list=None, storage: str = 'list'):
         self._collection = list()
+        self._bloom = None
+        self._subscribers = list()
 
         if _list is not None:
             self._collection = _list
 
+        if storage != 'list':
+            if storage not in storage_types:
+                raise DotListException(
+                    message=f'Storage is not of valid types list, '
+                    f'{", ".join(storage_types)}')
+            self._collection = storage_types[storage](self._collection)
+
+        if not isinstance(self._collection, LazyStorage):
+            self._update_attributes()
+
     def __repr__(self):
         items = ', '.join(
             [x.__repr__() for x in self._collection]
@@ -51,14 +95,91 @@ class dotlist:
         try:
             self._collection[accessor] = value
         except:
-            pass
+            return
+
+        if isinstance(accessor, slice):
+            self._track(value)
+            self._notify(Mutation.Reset)
+        else:
+            self._track([value])
+            self._notify(Mutation.Set,
+                         accessor % len(self._collection), value)
 
     def __iter__(self):
         return iter(self._collection)
 
+    def __len__(self):
+        return len(self._collection)
+
+    def __getattr__(self, name):
+        # lazy storage is only counted once count is first read
+        if name == 'count' and isinstance(
+                self.__dict__.get('_collection'), LazyStorage):
+            self._update_attributes()
+            return self.count
+        raise AttributeError(
+            f'{type(self).__name__!r} object has no attribute {name!r}')
+
     def _is_iterable(self, obj):
         return isinstance(obj, list) or isinstance(
-            obj, set) or isinstance(obj, tuple)
+            obj, set) or isinstance(obj, tuple) or isinstance(
+            obj, Storage)
+
+    def _unique(self) -> Iterable:
+        if isinstance(self._collection, CategoricalStorage):
+            return self._collection.unique()
+        return self._collection
+
+    def _track(self, elements: Iterable) -> None:
+        if self._bloom is None:
+            return
+
+        for element in elements:
+            try:
+                self._bloom.add(element)
+            except TypeError:
+                pass
+
+        if self._bloom.count > self._bloom.capacity:
+            self.attach_bloom(self._bloom.error_rate)
+
+    def _contains(self, obj: object) -> bool:
+        if self._bloom is not None:
+            try:
+                if obj not in self._bloom:
+                    return False
+            except TypeError:
+                pass
+        return obj in self._collection
+
+    def _notify(self, mutation: Mutation, index: int = None,
+                value: object = None) -> None:
+        for subscriber in list(self._subscribers):
+            callback = subscriber()
+            if callback is None:
+                self._subscribers.remove(subscriber)
+            else:
+                callback(mutation, index, value)
+
+    def _append(self, element: object) -> None:
+        if not isinstance(self._collection, BitmapStorage):
+            self._collection.append(element)
+            self._notify(Mutation.Insert, len(self._collection) - 1, element)
+        elif element not in self._collection:
+            # bitmaps keep their elements unique and in order
+            self._collection.append(element)
+            if self._subscribers:
+                self._notify(Mutation.Insert,
+                             self._collection.index(element), element)
+
+    def _remove(self, element: object) -> None:
+        if not self._subscribers:
+            self._collection.remove(element)
+            return
+
+        index = self._collection.index(element)
+        del self._collection[index]
+        self._notify(Mutation.Remove, index)
 
     def _update_attributes(self):
         _attributes = {
@@ -66,7 +187,50 @@ class dotlist:
         }
         self.__dict__.update(_attributes)
 
+    @classmethod
+    def from_records(cls, rows: Iterable) -> 'dotlist':
+        '''
+        Create a collection of dict records stored column by column.
+        Each field is kept in its own typed column, field projections
+        and filters read columns directly and rows are only rebuilt as
+        dicts when they are read.  select and to_dictionary call their
+        functions once with a placeholder row to detect projections
+
+        Example:
+            rows:
+                [{'name': 'dan', 'age': 30}, {'name': 'sam', 'age': 40}]
+            from_records:
+                dotlist.from_records(rows).select(lambda x: x['age'])
+            returns:
+                dl~ [30, 40]
+
+        Parameters:
+            rows (iterable): dict records
+
+        Returns:
+            collection (dotlist): the collection with columnar storage
+        '''
+
+        return cls(ColumnarStorage(rows))
+
+    def columns(self) -> dict:
+        '''
+        Gets each field of a collection of records as its own
+        collection
+
+        Returns:
+            columns (dict): a dotlist of values by field name
+        '''
+
+        storage = self._collection
+        if not isinstance(storage, ColumnarStorage):
+            storage = ColumnarStorage(storage)
+        return {field: dotlist(column) for field, column
+                in storage.columns().items()}
+
     def to_list(self):
+        if isinstance(self._collection, Storage):
+            return self._collection.to_list()
         return self._collection
 
     @update
@@ -83,9 +247,11 @@ class dotlist:
             self.add(obj._collection)
         elif self._is_iterable(obj):
             for element in obj:
-                self._collection.append(element)
+                self._append(element)
+            self._track(obj)
         else:
-            self._collection.append(obj)
+            self._append(obj)
+            self._track([obj])
 
     @update
     def remove(self, obj: Union[Iterable, object]) -> None:
@@ -100,10 +266,10 @@ class dotlist:
         if self._is_iterable(obj):
             for element in obj:
                 if self.has(element):
-                    self._collection.remove(element)
+                    self._remove(element)
         else:
             if self.has(obj):
-                self._collection.remove(obj)
+                self._remove(obj)
 
     def distinct(self) -> 'dotlist':
         '''
@@ -114,24 +280,102 @@ class dotlist:
             in the collection
         '''
 
+        if isinstance(self._collection, Storage):
+            return dotlist(self._collection.distinct())
+
         _distinct = list(set(self._collection))
         return dotlist(_distinct)
 
-    def count_distinct(self) -> int:
+    def count_distinct(self, approx: bool = False, precision: int = 14) -> int:
         '''
-        Gets the count of distinct elements of the collection
+        Gets the count of distinct elements of the collection,
+        optionally estimated with a HyperLogLog counter in fixed
+        memory
+
+        Parameters:
+            [optional] approx (bool): estimate the count
+            [optional] precision (int): the counter precision, the
+            relative standard error is 1.04 / sqrt(2^precision)
 
         Returns:
             count (int): the count of distinct elements in
             the collection
         '''
 
+        if approx:
+            return self.hyperloglog(precision).count()
+        if isinstance(self._collection, Storage):
+            return self._collection.count_distinct()
+
         return len(self.distinct())
 
-    def intersection(self, compare: Iterable) -> 'dotlist':
+    def hyperloglog(self, precision: int = 14) -> HyperLogLog:
         '''
-        Gets the mutual elements of the current collection and a
-        provided iterable
+        Gets a HyperLogLog counter of the elements in the collection.
+        Counters built over separate collections can be merged and
+        serialized
+
+        Parameters:
+            [optional] precision (int): the counter precision
+
+        Returns:
+            counter (HyperLogLog): the distinct counter
+        '''
+
+        counter = HyperLogLog(precision)
+        counter.update(self._collection)
+        return counter
+
+    def attach_bloom(self, error_rate: float = 0.01,
+                     capacity: int = None) -> BloomFilter:
+        '''
+        Attach a Bloom filter to the collection so has and nas reject
+        missing elements without scanning the collection.  The filter
+        is kept up to date as elements are added and is rebuilt at
+        twice the capacity when it fills up
+
+        Parameters:
+            [optional] error_rate (float): the false positive rate
+            [optional] capacity (int): the expected number of elements,
+            defaults to twice the size of the collection
+
+        Returns:
+            filter (BloomFilter): the attached filter
+        '''
+
+        if capacity is None:
+            capacity = max(2 * len(self._collection), 1024)
+
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._track(self._collection)
+        return self._bloom
+
+    def detach_bloom(self) -> None:
+        '''
+        Detach the Bloom filter from the collection
+        '''
+
+        self._bloom = None
+
+    def _bitmap(self, obj: Iterable,
+                strict: bool = False) -> Union[RoaringBitmap, None]:
+        if isinstance(obj, dotlist):
+            obj = obj._collection
+        if isinstance(obj, BitmapStorage):
+            return obj.bitmap
+
+        elements = list(obj)
+        ids = [x for x in elements if type(x) is int and x >= 0]
+        if strict and len(ids) < len(elements):
+            return None
+        return RoaringBitmap(ids)
+
+    def intersection(self, compare: Iterable, *others: Iterable) -> 'dotlist':
+        '''
+        Gets the mutual elements of the current collection and one or
+        more provided iterables.  Collections with bitmap storage
+        intersect block by block and return bitmap storage, ignoring
+        compared elements that are not non-negative integers
 
         Example:
             collection:
@@ -143,21 +387,31 @@ class dotlist:
 
         Parameters:
             compare (iterable): the iterable to compare
+            [optional] others (iterable): further iterables to compare
 
         Returns:
             elements (dotlist): the collection of mutual items
         '''
 
+        if isinstance(self._collection, BitmapStorage):
+            return dotlist(BitmapStorage(self._collection.bitmap.intersection(
+                *[self._bitmap(x) for x in (compare,) + others])))
+
         elements = dotlist()
         for element in compare:
             if self.has(element):
                 elements.add(element)
+
+        if others:
+            return elements.intersection(*others)
         return elements
 
     def difference(self, compare: Iterable) -> 'dotlist':
         '''
         Gets the different between the the current collection and a
-        provided iterable
+        provided iterable.  Collections with bitmap storage compare
+        block by block when every compared element is a non-negative
+        integer
 
         Example:
             colleciton:
@@ -174,6 +428,14 @@ class dotlist:
             elements (dotlist): the collection of differences
         '''
 
+        if isinstance(self._collection, BitmapStorage):
+            if not isinstance(compare, (dotlist, Storage)):
+                compare = list(compare)
+            bitmap = self._bitmap(compare, strict=True)
+            if bitmap is not None:
+                return dotlist(BitmapStorage(
+                    bitmap.difference(self._collection.bitmap)))
+
         elements = dotlist()
         for element in compare:
             if not self.has(element):
@@ -186,6 +448,7 @@ class dotlist:
         '''
 
         self._collection.reverse()
+        self._notify(Mutation.Reset)
 
     def at(self, index: int) -> Union[object, None]:
         '''
@@ -219,11 +482,11 @@ class dotlist:
 
         if self._is_iterable(obj):
             for element in obj:
-                if element not in self._collection:
+                if not self._contains(element):
                     return False
             return True
         else:
-            return obj in self._collection
+            return self._contains(obj)
 
     def nas(self, obj: Union[Iterable, object]) -> bool:
         '''
@@ -323,21 +586,70 @@ class dotlist:
             to insert the element
         '''
 
+        if isinstance(self._collection, BitmapStorage):
+            self._append(obj)
+            self._track([obj])
+            return
+
+        size = len(self._collection)
         if index is None:
             self._collection.append(obj)
         else:
             self._collection.insert(
                 index, obj)
+        self._track([obj])
+
+        if index is None:
+            index = size
+        elif index < 0:
+            index = max(index + size, 0)
+        self._notify(Mutation.Insert, min(index, size), obj)
 
     def clone(self) -> 'dotlist':
         '''
-        Gets a deep clone of the collection
+        Gets a clone of the collection.  Collections with persistent
+        storage are cloned in constant time and share their elements
+        with the clone until either is modified
 
         Returns:
             clone (dotlist): clone of the collection
         '''
 
-        return [x for x in self._collection]
+        return dotlist(self._collection.copy())
+
+    @staticmethod
+    def diff(old: 'dotlist', new: 'dotlist') -> tuple:
+        '''
+        Gets the elements added and removed between two versions of
+        a collection, typically a clone and the collection it was
+        cloned from.  Versions with persistent storage are compared
+        by skipping the structure they share
+
+        Example:
+            old:
+                dl~ ['howdy', 'there']
+            new:
+                dl~ ['howdy', 'world']
+            returns:
+                (dl~ ['world'], dl~ ['there'])
+
+        Parameters:
+            old (dotlist): the earlier version
+            new (dotlist): the later version
+
+        Returns:
+            result (tuple): the added and removed elements
+        '''
+
+        versions = list()
+        for version in (old, new):
+            storage = version._collection
+            if not isinstance(storage, PersistentStorage):
+                storage = PersistentStorage(storage)
+            versions.append(storage)
+
+        added, removed = diff(*versions)
+        return dotlist(added), dotlist(removed)
 
     def sort(self, desc: bool = False) -> None:
         '''
@@ -348,6 +660,7 @@ class dotlist:
         '''
 
         self._collection.sort(reverse=desc)
+        self._notify(Mutation.Reset)
 
     def apply(self, func: Callable, enum: bool = False) -> None:
         '''
@@ -364,7 +677,12 @@ class dotlist:
             collection to func
         '''
 
-        if enum:
+        if isinstance(self._collection, BitmapStorage):
+            self._collection = BitmapStorage(
+                [func(x, i) if enum else func(x)
+                 for i, x in enumerate(self._collection)])
+            self._update_attributes()
+        elif enum:
             for index in range(len(self._collection)):
                 self._collection[index] = func(
                     self._collection[index], index
@@ -375,6 +693,10 @@ class dotlist:
                     self._collection[index]
                 )
 
+        if self._bloom is not None:
+            self.attach_bloom(self._bloom.error_rate)
+        self._notify(Mutation.Reset)
+
     # def project(self, func):
     #     for item in self._collection:
     #         func(item)
@@ -384,13 +706,23 @@ class dotlist:
         Shave the first value off the collection in place
         '''
 
-        self._collection = self._collection[1:]
+        if isinstance(self._collection, Storage) and len(self._collection):
+            del self._collection[0]
+            self._notify(Mutation.Remove, 0)
+        elif len(self._collection):
+            self._collection = self._collection[1:]
+            self._notify(Mutation.Remove, 0)
 
     def shave_last(self):
         '''
         Shave the last value off the collection in place
         '''
-        self._collection = self._collection[:-1]
+        if isinstance(self._collection, Storage) and len(self._collection):
+            del self._collection[-1]
+            self._notify(Mutation.Remove, len(self._collection))
+        elif len(self._collection):
+            self._collection = self._collection[:-1]
+            self._notify(Mutation.Remove, len(self._collection))
 
     def first_or_none(self) -> object:
         '''
@@ -414,7 +746,7 @@ class dotlist:
             or None
         '''
 
-        return self.at(self.count - 1)
+        return self.at(-1)
 
     def where(self, func: Callable) -> 'dotlist':
         '''
@@ -439,6 +771,9 @@ class dotlist:
             where func is True
         '''
 
+        if isinstance(self._collection, ColumnarStorage):
+            return dotlist(self._collection.filter(func))
+
         elements = list()
         for item in self._collection:
             if func(item):
@@ -467,11 +802,73 @@ class dotlist:
             result (object): the evaluated collection
         '''
 
+        if isinstance(self._collection, ColumnarStorage):
+            field = self._collection.projection(func)
+            if field is not None:
+                return dotlist(self._collection.column(field))
+
         elements = list()
         for item in self._collection:
             elements.append(func(item))
         return dotlist(elements)
 
+    def view_where(self, func: Callable) -> 'dotlist':
+        '''
+        Return a read only view of the subset of the collection where
+        value returned by func is true.  The view is kept up to date as
+        the collection is mutated, evaluating func only over added or
+        replaced elements, until it is detached
+
+        example:
+            collection = dl~ ['hello', 'world']
+
+        function:
+            view = collection.view_where(lambda x: x == 'hello')
+            collection.add('hello')
+
+        returns:
+            view: dl~ ['hello', 'hello']
+
+        Parameters:
+            func (function): the condition to evaluate over the
+            collection
+
+        Returns:
+            result (dotlist_view): the maintained subset of the
+            collection where func is True
+        '''
+
+        from dotlist.views import where_view
+        return where_view(self, func)
+
+    def view_select(self, func: Callable) -> 'dotlist':
+        '''
+        Return a read only view of the results of the supplied function
+        over the collection.  The view is kept up to date as the
+        collection is mutated, evaluating func only over added or
+        replaced elements, until it is detached
+
+        example:
+            collection = dl~ ['hello', 'world']
+
+        function:
+            view = collection.view_select(lambda x: x.upper())
+            collection.add('howdy')
+
+        returns:
+            view: dl~ ['HELLO', 'WORLD', 'HOWDY']
+
+        Parameters:
+            func (function): the function to evaluate over the
+            collection
+
+        Returns:
+            result (dotlist_view): the maintained evaluated collection
+        '''
+
+        from dotlist.views import select_view
+        return select_view(self, func)
+
     def select_many(self, func: Callable) -> 'dotlist':
         '''
         Select over a collection of iterables
@@ -545,15 +942,30 @@ class dotlist:
                 break
         return elements
 
-    def union(self, obj: Iterable) -> None:
+    def union(self, obj: Iterable, *others: Iterable) -> None:
         '''
-        Union current collection with a given iterable in place
+        Union current collection with one or more given iterables in
+        place.  Collections with bitmap storage union block by block
 
         Parameters:
             obj (object): iterable to union
+            [optional] others (iterable): further iterables to union
         '''
 
-        self.add(obj)
+        if isinstance(self._collection, BitmapStorage):
+            bitmaps = [self._bitmap(x, strict=True) for x in (obj,) + others]
+            if None in bitmaps:
+                raise TypeError(
+                    'Bitmap storage only holds non-negative integers')
+            self._collection.bitmap = self._collection.bitmap.union(
+                *bitmaps)
+            self._track(self._collection)
+            self._notify(Mutation.Reset)
+            self._update_attributes()
+            return
+
+        for iterable in (obj,) + others:
+            self.add(iterable)
 
     def join(self, data: dict, how: JoinType = JoinType.Inner) -> dict:
         '''
@@ -607,7 +1019,7 @@ class dotlist:
         '''
 
         result = dict()
-        for item in self._collection:
+        for item in self._unique():
             value = data.get(item)
             if value:
                 result.update({
@@ -637,7 +1049,7 @@ class dotlist:
         '''
 
         result = dict()
-        for item in self._collection:
+        for item in self._unique():
             result.update({
                 item: data.get(item)
             })
@@ -754,6 +1166,11 @@ class dotlist:
             numeric (bool): is the collection numeric
         '''
 
+        if isinstance(self._collection, Storage):
+            numeric = self._collection.numeric()
+            if numeric is not None:
+                return numeric
+
         return self.all(lambda x: isinstance(x, int)
                         or isinstance(x, float))
 
@@ -815,6 +1232,133 @@ class dotlist:
         else:
             return None
 
+    def reduce(self, func: Callable, initial: object = _missing,
+               associative: bool = False, executor: str = 'thread',
+               workers: int = None, chunk_size: int = None) -> object:
+        '''
+        Reduce the collection to a single value by applying func to
+        the running result and each element in turn.  When func is
+        associative the collection is reduced in chunks on a thread or
+        process pool and the partial results are combined pairwise
+
+        Example:
+            collection:
+                dl~ [1, 2, 3, 4]
+            reduce:
+                dl.reduce(lambda x, y: x * y)
+            returns:
+                24
+
+        Parameters:
+            func (function): function combining two values
+            [optional] initial (object): value to start the reduction
+            [optional] associative (bool): func is associative and may be
+            evaluated as a parallel tree reduction
+            [optional] executor (str): the pool to run on, thread or
+            process.  Process pools require a picklable func
+            [optional] workers (int): the pool size
+            [optional] chunk_size (int): elements reduced per task
+
+        Returns:
+            result (object): the reduced value, or initial or None if
+            the collection is empty
+        '''
+
+        items = list(self._collection)
+        if not items:
+            return None if initial is _missing else initial
+        if not associative:
+            return reduce(func, items) if initial is _missing \
+                else reduce(func, items, initial)
+
+        if executor not in ('thread', 'process'):
+            raise DotListException(
+                message='Executor is not of valid types thread, process')
+
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or max(
+            -(-len(items) // (workers * 4)), 1024)
+        pool = ThreadPoolExecutor if executor == 'thread' \
+            else ProcessPoolExecutor
+
+        partials = [items[x: x + chunk_size]
+                    for x in range(0, len(items), chunk_size)]
+        task = partial(_reduce_chunk, func)
+        with pool(max_workers=workers) as tasks:
+            partials = list(tasks.map(task, partials))
+            while len(partials) > 1:
+                partials = list(tasks.map(
+                    task, [partials[x: x + 2]
+                           for x in range(0, len(partials), 2)]))
+
+        result = partials[0]
+        return result if initial is _missing else func(initial, result)
+
+    def fold(self, func: Callable, initial: object) -> object:
+        '''
+        Fold the collection from the left into an accumulator, applying
+        func to the accumulator and each element in turn.  Unlike reduce
+        the accumulator may be of a different type than the elements
+
+        Example:
+            collection:
+                dl~ ['howdy', 'there']
+            fold:
+                dl.fold(lambda total, x: total + len(x), 0)
+            returns:
+                10
+
+        Parameters:
+            func (function): function combining the accumulator and
+            an element
+            initial (object): the starting accumulator
+
+        Returns:
+            result (object): the final accumulator
+        '''
+
+        return reduce(func, self._collection, initial)
+
+    def scan(self, func: Callable = None,
+             initial: object = _missing) -> 'dotlist':
+        '''
+        Gets the running results of reducing the collection with func,
+        summing when no func is given.  The results are computed lazily
+        as they are read, over the elements of the collection at the
+        time of the call
+
+        Example:
+            collection:
+                dl~ [1, 2, 3, 4]
+            scan:
+                dl.scan()
+            returns:
+                dl~ [1, 3, 6, 10]
+
+        Parameters:
+            [optional] func (function): function combining two values
+            [optional] initial (object): value to start the scan, which
+            is included as the first result
+
+        Returns:
+            result (dotlist): the prefix results
+        '''
+
+        items = self._collection.copy()
+        if initial is not _missing:
+            items = chain([initial], items)
+
+        return dotlist(LazyStorage(
+            accumulate(items, func or operator.add)))
+
+    def accumulate(self, func: Callable = None,
+                   initial: object = _missing) -> 'dotlist':
+        '''
+        Alias of scan
+        '''
+
+        return self.scan(func, initial)
+
     def group_by(self, func):
         '''
         TODO: Groupby function
@@ -842,6 +1386,13 @@ class dotlist:
             result (dict): generated dictionary
         '''
 
+        if isinstance(self._collection, ColumnarStorage):
+            key_field = self._collection.projection(key_func)
+            value_field = self._collection.projection(value_func)
+            if key_field is not None and value_field is not None:
+                return dict(zip(self._collection.column(key_field),
+                                self._collection.column(value_field)))
+
         _dict = dict()
         for item in self._collection:
             _dict.update({
@@ -0,0 +1,229 @@
+from collections.abc import Iterable
+from functools import wraps
+from typing import Union
+import threading
+
+from dotlist.collections import Mutation, dotlist
+from dotlist.persistent import PersistentStorage
+
+
+def _read(func):
+    @wraps(func)
+    def wrap(self, *args, **kwargs):
+        return func(self._snapshot(), *args, **kwargs)
+    return wrap
+
+
+def _atomic(func):
+    @wraps(func)
+    def wrap(self, *args, **kwargs):
+        with self._lock:
+            writer, self._writer = self._writer, threading.get_ident()
+            try:
+                self._drain()
+                result = func(self, *args, **kwargs)
+                self._publish()
+            finally:
+                self._writer = writer
+        return result
+    return wrap
+
+
+class _Buffer:
+    __slots__ = ('lock', 'items')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = list()
+
+
+class concurrent_dotlist(dotlist):
+    '''
+    Thread safe dotlist.  Each writing thread adds to its own buffer,
+    and buffers are merged into the collection in batches.  Mutations
+    are applied to persistent storage under a lock and published once
+    complete, so readers always see a consistent snapshot and never
+    observe a mutation half applied.  Readers take no lock shared with
+    writers: they see the last published snapshot plus their own
+    buffered elements, while elements buffered by other threads appear
+    once their batch is merged, when it fills, on flush or on the next
+    mutation.  Elements added by one thread keep their order, elements
+    added by different threads are interleaved by batch
+    '''
+
+    def __init__(self, _list=None, batch_size: int = 256):
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._buffers = list()
+        self._batch_size = batch_size
+        self._writer = None
+
+        super().__init__(
+            PersistentStorage(_list if _list is not None else []))
+        self._publish()
+
+    @property
+    def count(self) -> int:
+        return len(self._snapshot())
+
+    def _buffer(self) -> _Buffer:
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = _Buffer()
+            self._local.buffer = buffer
+            with self._lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def _drain(self) -> None:
+        # buffers stay locked until the merged batch is published, so a
+        # reader finds its elements either buffered or published
+        buffers = list(self._buffers)
+        for buffer in buffers:
+            buffer.lock.acquire()
+        try:
+            pending = list()
+            for buffer in buffers:
+                pending.extend(buffer.items)
+                buffer.items = list()
+
+            start = len(self._collection)
+            if pending:
+                self._collection.extend(pending)
+                self._track(pending)
+                self._publish()
+        finally:
+            for buffer in buffers:
+                buffer.lock.release()
+
+        for index, element in enumerate(pending, start):
+            self._notify(Mutation.Insert, index, element)
+
+    def _publish(self) -> None:
+        self._published = (self._collection.copy(), self._bloom)
+        self._update_attributes()
+
+    def _snapshot(self) -> dotlist:
+        if self._writer == threading.get_ident():
+            snapshot = dotlist(self._collection)
+            snapshot._bloom = self._bloom
+            return snapshot
+
+        pending = None
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            published, bloom = self._published
+        else:
+            with buffer.lock:
+                published, bloom = self._published
+                pending = list(buffer.items)
+
+        storage = published.copy()
+        if pending:
+            storage.extend(pending)
+            bloom = None
+
+        snapshot = dotlist(storage)
+        snapshot._bloom = bloom
+        return snapshot
+
+    def flush(self) -> None:
+        '''
+        Merge the buffered elements of every thread into the collection
+        '''
+
+        with self._lock:
+            self._drain()
+
+    def snapshot(self) -> dotlist:
+        '''
+        Gets a consistent snapshot of the collection without waiting
+        for writers.  The snapshot shares storage with the collection
+        and is taken in constant time, plus the elements still buffered
+        by the calling thread
+
+        Returns:
+            snapshot (dotlist): the snapshot
+        '''
+
+        return self._snapshot()
+
+    def add(self, obj: Union[Iterable, object]) -> None:
+        '''
+        Adds a single item or an iterable to the calling thread's buffer.
+        The buffer is merged into the collection once it fills, on flush
+        or on the next mutation, and is visible to reads from the
+        calling thread straight away
+
+        Parameters:
+            obj: an item or iterable
+        '''
+
+        buffer = self._buffer()
+        with buffer.lock:
+            if isinstance(obj, dotlist):
+                buffer.items.extend(obj.to_list())
+            elif self._is_iterable(obj):
+                buffer.items.extend(obj)
+            else:
+                buffer.items.append(obj)
+            full = len(buffer.items) >= self._batch_size
+
+        if full:
+            self.flush()
+
+    remove = _atomic(dotlist.remove)
+    insert = _atomic(dotlist.insert)
+    reverse = _atomic(dotlist.reverse)
+    sort = _atomic(dotlist.sort)
+    apply = _atomic(dotlist.apply)
+    shave_first = _atomic(dotlist.shave_first)
+    shave_last = _atomic(dotlist.shave_last)
+    attach_bloom = _atomic(dotlist.attach_bloom)
+    detach_bloom = _atomic(dotlist.detach_bloom)
+    view_where = _atomic(dotlist.view_where)
+    view_select = _atomic(dotlist.view_select)
+    __setitem__ = _atomic(dotlist.__setitem__)
+
+    __repr__ = _read(dotlist.__repr__)
+    __getitem__ = _read(dotlist.__getitem__)
+    __iter__ = _read(dotlist.__iter__)
+    __len__ = _read(dotlist.__len__)
+    to_list = _read(dotlist.to_list)
+    distinct = _read(dotlist.distinct)
+    count_distinct = _read(dotlist.count_distinct)
+    hyperloglog = _read(dotlist.hyperloglog)
+    intersection = _read(dotlist.intersection)
+    difference = _read(dotlist.difference)
+    at = _read(dotlist.at)
+    has = _read(dotlist.has)
+    nas = _read(dotlist.nas)
+    range = _read(dotlist.range)
+    enumerate = _read(dotlist.enumerate)
+    index = _read(dotlist.index)
+    find = _read(dotlist.find)
+    clone = _read(dotlist.clone)
+    first_or_none = _read(dotlist.first_or_none)
+    last_or_none = _read(dotlist.last_or_none)
+    where = _read(dotlist.where)
+    select = _read(dotlist.select)
+    select_many = _read(dotlist.select_many)
+    take = _read(dotlist.take)
+    take_while = _read(dotlist.take_while)
+    join = _read(dotlist.join)
+    join_inner = _read(dotlist.join_inner)
+    join_left = _read(dotlist.join_left)
+    zip = _read(dotlist.zip)
+    any = _read(dotlist.any)
+    all = _read(dotlist.all)
+    skip = _read(dotlist.skip)
+    is_numeric = _read(dotlist.is_numeric)
+    average = _read(dotlist.average)
+    sum = _read(dotlist.sum)
+    max = _read(dotlist.max)
+    min = _read(dotlist.min)
+    reduce = _read(dotlist.reduce)
+    fold = _read(dotlist.fold)
+    scan = _read(dotlist.scan)
+    accumulate = _read(dotlist.accumulate)
+    to_dictionary = _read(dotlist.to_dictionary)
@@ -0,0 +1,282 @@
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterable
+from typing import Tuple
+
+from dotlist.storage import Storage
+
+
+_width = 32
+
+
+class _Branch:
+    __slots__ = ('children', 'offsets', 'height')
+
+    def __init__(self, children: tuple, height: int):
+        self.children = children
+        self.height = height
+
+        offsets, size = [], 0
+        for child in children:
+            size += _size(child)
+            offsets.append(size)
+        self.offsets = tuple(offsets)
+
+    @property
+    def size(self):
+        return self.offsets[-1] if self.offsets else 0
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        position = min(
+            bisect_right(self.offsets, index), len(self.children) - 1)
+        start = self.offsets[position - 1] if position else 0
+        return position, index - start
+
+
+def _size(node) -> int:
+    return len(node) if isinstance(node, tuple) else node.size
+
+
+def _height(node) -> int:
+    return 0 if isinstance(node, tuple) else node.height
+
+
+def _build(items: list):
+    nodes = [tuple(items[x: x + _width])
+             for x in range(0, len(items), _width)] or [()]
+    height = 0
+    while len(nodes) > 1:
+        height += 1
+        nodes = [_Branch(tuple(nodes[x: x + _width]), height)
+                 for x in range(0, len(nodes), _width)]
+    return nodes[0]
+
+
+def _split(node) -> tuple:
+    if isinstance(node, tuple):
+        if len(node) <= _width:
+            return (node,)
+        half = len(node) // 2
+        return (node[:half], node[half:])
+
+    if len(node.children) <= _width:
+        return (node,)
+    half = len(node.children) // 2
+    return (_Branch(node.children[:half], node.height),
+            _Branch(node.children[half:], node.height))
+
+
+def _set(node, index: int, value):
+    if isinstance(node, tuple):
+        return node[:index] + (value,) + node[index + 1:]
+
+    position, offset = node.locate(index)
+    children = list(node.children)
+    children[position] = _set(children[position], offset, value)
+    return _Branch(tuple(children), node.height)
+
+
+def _insert(node, index: int, value) -> tuple:
+    if isinstance(node, tuple):
+        return _split(node[:index] + (value,) + node[index:])
+
+    position, offset = node.locate(index)
+    children = node.children
+    children = children[:position] + _insert(
+        children[position], offset, value) + children[position + 1:]
+    return _split(_Branch(children, node.height))
+
+
+def _delete(node, index: int):
+    if isinstance(node, tuple):
+        return node[:index] + node[index + 1:]
+
+    position, offset = node.locate(index)
+    child = _delete(node.children[position], offset)
+    replacement = (child,) if _size(child) else ()
+    children = node.children[:position] + \
+        replacement + node.children[position + 1:]
+    return _Branch(children, node.height) if children else ()
+
+
+def _replace_last(node, leaf: tuple):
+    if isinstance(node, tuple):
+        return leaf
+
+    children = node.children[:-1] + (_replace_last(node.children[-1], leaf),)
+    return _Branch(children, node.height)
+
+
+def _push(node, leaf: tuple) -> tuple:
+    if isinstance(node, tuple):
+        return (node, leaf) if node else (leaf,)
+
+    if node.height == 1:
+        children = node.children + (leaf,)
+    else:
+        children = node.children[:-1] + _push(node.children[-1], leaf)
+    return _split(_Branch(children, node.height))
+
+
+def _leaves(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, tuple):
+            yield node
+        else:
+            stack.extend(reversed(node.children))
+
+
+class PersistentStorage(Storage):
+    '''
+    Persistent storage built on a balanced tree of fixed size chunks.
+    Reads, writes and inserts copy only the path to the affected chunk,
+    so copies are made in constant time and share every chunk they
+    have not modified since
+    '''
+
+    def __init__(self, data: Iterable = None):
+        self._root = _build(list(data) if data is not None else [])
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __iter__(self):
+        for leaf in _leaves(self._root):
+            yield from leaf
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PersistentStorage(list(self)[index])
+
+        index = self._normalize(index)
+        node = self._root
+        while not isinstance(node, tuple):
+            position, index = node.locate(index)
+            node = node.children[position]
+        return node[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self._root = _build(items)
+        else:
+            self._root = _set(self._root, self._normalize(index), value)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self._root = _build(items)
+            return
+
+        root = _delete(self._root, self._normalize(index))
+        while not isinstance(root, tuple) and len(root.children) == 1:
+            root = root.children[0]
+        self._root = root
+
+    def _normalize(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('storage index out of range')
+        return index
+
+    def insert(self, index: int, value) -> None:
+        size = len(self)
+        if index < 0:
+            index = max(index + size, 0)
+        index = min(index, size)
+
+        nodes = _insert(self._root, index, value)
+        if len(nodes) > 1:
+            nodes = (_Branch(nodes, _height(nodes[0]) + 1),)
+        self._root = nodes[0]
+
+    def append(self, value) -> None:
+        self.insert(len(self), value)
+
+    def extend(self, values: Iterable) -> None:
+        node = self._root
+        while not isinstance(node, tuple):
+            node = node.children[-1]
+
+        items = node + tuple(values)
+        root = _replace_last(self._root, items[:_width])
+        for start in range(_width, len(items), _width):
+            nodes = _push(root, items[start: start + _width])
+            if len(nodes) > 1:
+                nodes = (_Branch(nodes, _height(nodes[0]) + 1),)
+            root = nodes[0]
+        self._root = root
+
+    def index(self, value, start: int = 0, stop: int = None) -> int:
+        for index, element in enumerate(self):
+            if stop is not None and index >= stop:
+                break
+            if index >= start and element == value:
+                return index
+        raise ValueError(f'{value!r} is not in storage')
+
+    def reverse(self) -> None:
+        self._root = _build(list(self)[::-1])
+
+    def copy(self) -> 'PersistentStorage':
+        clone = PersistentStorage()
+        clone._root = self._root
+        return clone
+
+
+def _multiset_difference(left: list, right: list) -> list:
+    try:
+        return list((Counter(left) - Counter(right)).elements())
+    except TypeError:
+        remaining = list(right)
+        difference = list()
+        for element in left:
+            if element in remaining:
+                remaining.remove(element)
+            else:
+                difference.append(element)
+        return difference
+
+
+def diff(old: 'PersistentStorage', new: 'PersistentStorage') -> tuple:
+    '''
+    Gets the elements added and removed between two versions of
+    persistent storage.  Subtrees shared between the versions are
+    skipped, so the cost follows the size of the change rather than
+    the size of the storage
+
+    Parameters:
+        old (PersistentStorage): the earlier version
+        new (PersistentStorage): the later version
+
+    Returns:
+        result (tuple): the lists of added and removed elements
+    '''
+
+    before = {id(old._root): old._root}
+    after = {id(new._root): new._root}
+    while True:
+        for shared in before.keys() & after.keys():
+            del before[shared], after[shared]
+
+        height = max(map(_height, [*before.values(), *after.values()]),
+                     default=0)
+        if height == 0:
+            break
+
+        for frontier in (before, after):
+            for key, node in list(frontier.items()):
+                if _height(node) == height:
+                    del frontier[key]
+                    frontier.update({id(x): x for x in node.children})
+
+    removed = [x for leaf in before.values() for x in leaf]
+    added = [x for leaf in after.values() for x in leaf]
+    return (_multiset_difference(added, removed),
+            _multiset_difference(removed, added))
@@ -0,0 +1,687 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from itertools import count
+from multiprocessing.reduction import ForkingPickler
+from typing import Callable, Union
+import multiprocessing
+import os
+import random
+import threading
+import weakref
+
+from dotlist.approximate import _stable_hash
+from dotlist.collections import DotListException, dotlist
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    shared_memory = None
+
+
+_shared_threshold = 1024
+
+
+def _typecode(values: list) -> Union[str, None]:
+    if all(type(x) is float for x in values):
+        return 'd'
+    if all(type(x) is int and -2 ** 63 <= x < 2 ** 63 for x in values):
+        return 'q'
+    return None
+
+
+def _pack(values: list) -> tuple:
+    '''
+    Prepare elements to be sent to another process.  Large numeric
+    collections are written to shared memory, which the receiver
+    unlinks once read
+    '''
+
+    typecode = None
+    if shared_memory is not None and len(values) >= _shared_threshold:
+        typecode = _typecode(values)
+    if typecode is None:
+        return ('list', values)
+
+    data = array(typecode, values)
+    block = shared_memory.SharedMemory(create=True, size=len(data) * 8)
+    block.buf[:len(data) * 8] = data.tobytes()
+    block.close()
+    return ('shared', block.name, typecode, len(data))
+
+
+def _unpack(payload: tuple) -> list:
+    if payload[0] == 'list':
+        return payload[1]
+
+    _, name, typecode, length = payload
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        data = array(typecode)
+        data.frombytes(bytes(block.buf[:length * 8]))
+    finally:
+        block.close()
+        block.unlink()
+    return data.tolist()
+
+
+def _group(collection: dotlist, key_func: Callable, value_func: Callable,
+           reduce_func: Callable) -> dict:
+    groups = dict()
+    for item in collection:
+        key = key_func(item)
+        value = value_func(item) if value_func is not None else item
+        if reduce_func is None:
+            groups.setdefault(key, list()).append(value)
+        elif key in groups:
+            groups[key] = reduce_func(groups[key], value)
+        else:
+            groups[key] = value
+    return groups
+
+
+def _bounds(collection: dotlist) -> Union[tuple, None]:
+    if not len(collection) or not collection.is_numeric():
+        return None
+    return collection.min(), collection.max()
+
+
+def _load(datasets: dict, key: int, payload: tuple) -> None:
+    datasets[key] = dotlist(_unpack(payload))
+
+
+def _derive(datasets: dict, key: int, source: int, method: str,
+            args: tuple) -> None:
+    datasets[key] = getattr(datasets[source], method)(*args)
+
+
+def _call(datasets: dict, key: int, method: str, args: tuple) -> object:
+    return getattr(datasets[key], method)(*args)
+
+
+def _apply(datasets: dict, key: int, func: Callable, args: tuple) -> object:
+    return func(datasets[key], *args)
+
+
+def _export(datasets: dict, key: int) -> tuple:
+    return _pack(datasets[key].to_list())
+
+
+def _drop(datasets: dict, key: int) -> None:
+    datasets.pop(key, None)
+
+
+_commands = {
+    'load': _load,
+    'derive': _derive,
+    'call': _call,
+    'apply': _apply,
+    'export': _export,
+    'drop': _drop
+}
+
+
+def _serve(connection) -> None:
+    datasets = dict()
+    while True:
+        command, args = connection.recv()
+        if command == 'stop':
+            break
+
+        try:
+            connection.send((True, _commands[command](datasets, *args)))
+        except Exception as ex:
+            connection.send((False, f'{type(ex).__name__}: {ex}'))
+    connection.close()
+
+
+def _stop(connections: list, processes: list) -> None:
+    for connection in connections:
+        try:
+            connection.send(('stop', ()))
+        except OSError:
+            pass
+        connection.close()
+    for process in processes:
+        process.join()
+    connections.clear()
+    processes.clear()
+
+
+class _Cluster:
+    def __init__(self, shards: int):
+        self._lock = threading.Lock()
+        self._keys = count()
+        self._released = list()
+        self.connections = list()
+        self.processes = list()
+
+        if shared_memory is not None:
+            # workers share one tracker so blocks unlinked by the
+            # receiving process are not reported as leaked
+            resource_tracker.ensure_running()
+
+        for _ in range(shards):
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        # stop the workers once the last collection using them is
+        # collected, the finalizer must not reference the cluster
+        self._finalizer = weakref.finalize(
+            self, _stop, self.connections, self.processes)
+
+    def __len__(self):
+        return len(self.connections)
+
+    @property
+    def closed(self) -> bool:
+        return not self.connections
+
+    def key(self) -> int:
+        return next(self._keys)
+
+    def request(self, commands: list) -> list:
+        '''
+        Send one command to each worker, or None to leave the worker
+        idle, run them in parallel and gather the results in shard order
+        '''
+
+        if self.closed:
+            raise DotListException(message='Sharded collection is closed')
+
+        # serialize up front so a command that cannot be pickled fails
+        # before any worker has been sent anything
+        messages = [ForkingPickler.dumps(x) if x is not None else None
+                    for x in commands]
+        with self._lock:
+            self._release()
+            replies = self._exchange(messages)
+
+        errors = [result for ok, result in replies if not ok]
+        if errors:
+            raise DotListException(
+                message=f'Shard failed with {errors[0]}')
+        return [result for _, result in replies]
+
+    def _exchange(self, messages: list) -> list:
+        sent = list()
+        try:
+            for connection, message in zip(self.connections, messages):
+                if message is not None:
+                    connection.send_bytes(message)
+                    sent.append(connection)
+        finally:
+            # every worker that was sent a command replies, read them
+            # all even if a later send failed to stay in step
+            replies = {id(x): x.recv() for x in sent}
+        return [replies.get(id(x), (True, None)) for x in self.connections]
+
+    def _release(self) -> None:
+        while self._released and not self.closed:
+            key = self._released.pop()
+            self._exchange(
+                [ForkingPickler.dumps(('drop', (key,)))] * len(self))
+
+    def broadcast(self, command: str, *args) -> list:
+        return self.request([(command, args)] * len(self))
+
+    def release(self, key: int) -> None:
+        '''
+        Drop a dataset from every worker.  Called by finalizers, which
+        may run while a request holds the lock, so the drop waits for
+        the next request when the cluster is busy
+        '''
+
+        self._released.append(key)
+        if self._lock.acquire(blocking=False):
+            try:
+                self._release()
+            except (OSError, EOFError):
+                pass
+            finally:
+                self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._finalizer()
+
+
+class sharded_dotlist:
+    '''
+    Collection partitioned across local worker processes.  Elements stay
+    resident in the workers: filters and projections produce new sharded
+    collections without moving data, and aggregates run per shard with
+    only the partial results returned for the final reduce.  Functions
+    passed to the workers must be picklable, e.g. defined at module level
+
+    Elements are partitioned by hash, or by range over a sample of the
+    elements.  Either way equal elements land on the same shard, which
+    lets distinct, count_distinct and has work shard by shard.  Elements
+    that cannot be hashed or ordered, such as dict records, are dealt
+    to the shards round robin instead, and those operations combine the
+    results of every shard.  The workers release a collection's
+    elements once it is garbage collected, or when it is dropped, and
+    stop once every collection using them is collected or closed
+    '''
+
+    def __init__(self, _list: Iterable = None, shards: int = None,
+                 partition: str = 'hash'):
+        if partition not in ('hash', 'range'):
+            raise DotListException(
+                message='Partition is not of valid types hash, range')
+
+        elements = list(_list) if _list is not None else list()
+
+        self._cluster = _Cluster(shards or os.cpu_count() or 1)
+        self._partition = partition
+        self._boundaries = None
+        if partition == 'range':
+            self._boundaries = self._sample_boundaries(elements)
+
+        self._key = self._cluster.key()
+        self._partitioned = partition == 'hash' or \
+            self._boundaries is not None
+        self._register()
+        try:
+            self._load(elements)
+        except BaseException:
+            self.close()
+            raise
+
+    def __repr__(self):
+        return f'sdl~ [{len(self)} elements in {len(self._cluster)} shards]'
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __len__(self):
+        return sum(self._call('__len__'))
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _sample_boundaries(self, elements: list) -> list:
+        shards = len(self._cluster)
+        try:
+            sample = sorted(
+                random.sample(elements, min(len(elements), 10000)))
+        except TypeError:
+            return None
+        return [sample[len(sample) * x // shards] for x in range(1, shards)] \
+            if sample else list()
+
+    def _shard(self, element: object) -> int:
+        if self._partition == 'range':
+            return bisect_right(self._boundaries, element)
+        return _stable_hash(element) % len(self._cluster)
+
+    def _split(self, elements: list) -> list:
+        shards = len(self._cluster)
+        if self._partitioned:
+            partitions = [list() for _ in range(shards)]
+            try:
+                for element in elements:
+                    partitions[self._shard(element)].append(element)
+                return partitions
+            except TypeError:
+                self._partitioned = False
+        return [elements[x::shards] for x in range(shards)]
+
+    def _load(self, elements: Iterable) -> None:
+        self._cluster.request(
+            [('load', (self._key, _pack(x)))
+             for x in self._split(list(elements))])
+
+    def _register(self) -> None:
+        self._finalizer = weakref.finalize(
+            self, self._cluster.release, self._key)
+        self._finalizer.atexit = False
+
+    def _call(self, method: str, *args) -> list:
+        return self._cluster.broadcast('call', self._key, method, args)
+
+    def _derive(self, method: str, *args,
+                partitioned: bool = None) -> 'sharded_dotlist':
+        derived = object.__new__(sharded_dotlist)
+        derived._cluster = self._cluster
+        derived._partition = self._partition
+        derived._boundaries = self._boundaries
+        derived._key = self._cluster.key()
+        derived._partitioned = self._partitioned \
+            if partitioned is None else partitioned
+        derived._register()
+
+        if method is not None:
+            self._cluster.broadcast(
+                'derive', derived._key, self._key, method, args)
+        return derived
+
+    def _bounds(self) -> Union[list, None]:
+        if not self.is_numeric():
+            return None
+        return [x for x in self._cluster.broadcast(
+            'apply', self._key, _bounds, ()) if x is not None]
+
+    @property
+    def shards(self) -> int:
+        '''
+        The number of worker processes holding the collection
+        '''
+
+        return len(self._cluster)
+
+    @property
+    def count(self) -> int:
+        return len(self)
+
+    def close(self) -> None:
+        '''
+        Stop the worker processes.  This closes every collection derived
+        from the same source
+        '''
+
+        if not self._cluster.closed:
+            self._cluster.close()
+
+    def drop(self) -> None:
+        '''
+        Release the elements of this collection held by the workers
+        '''
+
+        if self._finalizer.detach() is not None:
+            self._cluster.broadcast('drop', self._key)
+
+    def to_list(self) -> list:
+        '''
+        Gather the elements of every shard
+
+        Returns:
+            elements (list): the elements, grouped by shard
+        '''
+
+        elements = list()
+        for payload in self._cluster.broadcast('export', self._key):
+            elements.extend(_unpack(payload))
+        return elements
+
+    def collect(self) -> dotlist:
+        '''
+        Gather the elements of every shard into a dotlist
+
+        Returns:
+            collection (dotlist): the gathered collection
+        '''
+
+        return dotlist(self.to_list())
+
+    def where(self, func: Callable) -> 'sharded_dotlist':
+        '''
+        Return the subset of the collection where value returned by
+        func is true, evaluated in parallel and kept in the workers
+
+        Parameters:
+            func (function): the condition to evaluate over the
+            collection
+
+        Returns:
+            result (sharded_dotlist): the subset of the collection
+        '''
+
+        return self._derive('where', func)
+
+    def skip(self, func: Callable) -> 'sharded_dotlist':
+        '''
+        Return the subset of the collection excluding elements where
+        value returned by func is true, kept in the workers
+
+        Parameters:
+            func (function): function to evaluate over collection
+
+        Returns:
+            result (sharded_dotlist): the subset of the collection
+        '''
+
+        return self._derive('skip', func)
+
+    def select(self, func: Callable) -> 'sharded_dotlist':
+        '''
+        Return the results of func over the collection, evaluated in
+        parallel and kept in the workers.  The results are no longer
+        partitioned by value
+
+        Parameters:
+            func (function): the function to evaluate over the
+            collection
+
+        Returns:
+            result (sharded_dotlist): the evaluated collection
+        '''
+
+        return self._derive('select', func, partitioned=False)
+
+    def distinct(self) -> 'sharded_dotlist':
+        '''
+        Gets the distinct elements of the collection.  Elements that are
+        no longer partitioned by value are repartitioned first
+
+        Returns:
+            result (sharded_dotlist): the distinct elements
+        '''
+
+        if self._partitioned:
+            return self._derive('distinct')
+
+        derived = self._derive(None, partitioned=True)
+        elements = set()
+        for shard in self._call('distinct'):
+            elements.update(shard)
+        derived._load(elements)
+        return derived
+
+    def count_distinct(self) -> int:
+        '''
+        Gets the count of distinct elements of the collection
+
+        Returns:
+            count (int): the count of distinct elements
+        '''
+
+        if self._partitioned:
+            return sum(self._call('count_distinct'))
+
+        elements = set()
+        for shard in self._call('distinct'):
+            elements.update(shard)
+        return len(elements)
+
+    def has(self, obj: object) -> bool:
+        '''
+        Checks if an element exists in the collection.  Only the shard
+        the element is partitioned to is searched
+
+        Parameters:
+            obj (object): the element to look up
+
+        Returns:
+            exists (bool): True if the element exists
+        '''
+
+        try:
+            shard = self._shard(obj) if self._partitioned else None
+        except TypeError:
+            shard = None
+
+        if shard is not None:
+            commands = [None] * len(self._cluster)
+            commands[shard] = ('call', (self._key, 'has', ([obj],)))
+            return self._cluster.request(commands)[shard]
+
+        return any(self._call('has', [obj]))
+
+    def nas(self, obj: object) -> bool:
+        '''
+        Checks if an element does not exist in the collection
+
+        Parameters:
+            obj (object): the element to look up
+
+        Returns:
+            exists (bool): True if the element does not exist
+        '''
+
+        return not self.has(obj)
+
+    def any(self, func: Callable) -> bool:
+        '''
+        Evaluate if any of the elements return True when evaluated by
+        the given func
+
+        Parameters:
+            func (function): function to evaluate over collection
+
+        Returns:
+            result (bool): True if any element evaluates True
+        '''
+
+        return any(self._call('any', func))
+
+    def all(self, func: Callable) -> bool:
+        '''
+        Evaluate if all of the elements return True when evaluated by
+        the given func
+
+        Parameters:
+            func (function): function to evaluate over collection
+
+        Returns:
+            result (bool): True if all elements evaluate True
+        '''
+
+        return all(self._call('all', func))
+
+    def is_numeric(self) -> bool:
+        '''
+        Is the collection composed of only numeric (int or float) types
+
+        Returns:
+            numeric (bool): is the collection numeric
+        '''
+
+        return all(self._call('is_numeric'))
+
+    def sum(self) -> Union[int, float, None]:
+        '''
+        Returns the sum of values in the collection if the collection
+        is numeric
+
+        Returns:
+            sum (int, float, None): the sum of the numeric values
+        '''
+
+        sums = self._call('sum')
+        return None if None in sums else sum(sums)
+
+    def max(self) -> Union[int, float, None]:
+        '''
+        Returns the maximum value if the collection is numeric
+
+        Returns:
+            max (int, float, None): the maximum numeric value
+        '''
+
+        bounds = self._bounds()
+        return max(x[1] for x in bounds) if bounds else None
+
+    def min(self) -> Union[int, float, None]:
+        '''
+        Returns the minimum value if the collection is numeric
+
+        Returns:
+            min (int, float, None): the minimum numeric value
+        '''
+
+        bounds = self._bounds()
+        return min(x[0] for x in bounds) if bounds else None
+
+    def average(self) -> Union[int, float, None]:
+        '''
+        Average of all numeric values in the collection, or None if the
+        collection is empty or not numeric
+
+        Returns:
+            average (int, float, None): the average value
+        '''
+
+        total, size = self.sum(), len(self)
+        if total is None or not size:
+            return None
+        return total / size
+
+    def group_by(self, key_func: Callable, value_func: Callable = None,
+                 reduce_func: Callable = None) -> dict:
+        '''
+        Group the collection by the key returned by key_func.  Without
+        reduce_func each group is a list of values, otherwise groups
+        are combined with reduce_func within each shard and again
+        across shards
+
+        Example:
+            collection:
+                sdl~ ['howdy', 'there', 'hi']
+            group_by:
+                sdl.group_by(len, lambda x: 1, operator.add)
+            returns:
+                {5: 2, 2: 1}
+
+        Parameters:
+            key_func (function): function to project the group key
+            [optional] value_func (function): function to project the
+            grouped value, defaults to the element
+            [optional] reduce_func (function): associative function to
+            combine two grouped values
+
+        Returns:
+            result (dict): the groups by key
+        '''
+
+        groups = dict()
+        for shard in self._cluster.broadcast(
+                'apply', self._key, _group,
+                (key_func, value_func, reduce_func)):
+            for key, value in shard.items():
+                if key not in groups:
+                    groups[key] = value
+                elif reduce_func is None:
+                    groups[key].extend(value)
+                else:
+                    groups[key] = reduce_func(groups[key], value)
+        return groups
+
+    def map_reduce(self, mapper: Callable, reducer: Callable) -> object:
+        '''
+        Run mapper over the dotlist held by each shard in parallel and
+        reduce the list of partial results in this process
+
+        Parameters:
+            mapper (function): function from a shard's dotlist to a
+            partial result
+            reducer (function): function from the list of partial
+            results to the final result
+
+        Returns:
+            result (object): the reduced result
+        '''
+
+        return reducer(self._cluster.broadcast(
+            'apply', self._key, mapper, ()))
@@ -0,0 +1,890 @@
+from array import array
+from collections import Counter, deque
+from collections.abc import Iterable, Mapping, MutableSequence, Sequence
+from itertools import islice
+from typing import Callable, Union
+
+
+class Storage(MutableSequence):
+    '''
+    Base class for alternative dotlist storage.  Storage behaves like a
+    list, including slicing, and subclasses may override the fast paths
+    below
+    '''
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self)!r})'
+
+    def copy(self) -> 'Storage':
+        return type(self)(self)
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def distinct(self) -> Iterable:
+        return list(set(self))
+
+    def count_distinct(self) -> int:
+        return len(set(self))
+
+    def numeric(self) -> Union[bool, None]:
+        return None
+
+    def sort(self, reverse: bool = False) -> None:
+        self[:] = sorted(self, reverse=reverse)
+
+
+class LazyStorage(Storage):
+    '''
+    Storage over an iterator that is only consumed as elements are
+    read.  Iteration and indexing pull just the elements they need, any
+    other operation consumes the iterator first
+    '''
+
+    def __init__(self, data: Iterable = None):
+        self._items = list()
+        self._source = iter(data) if data is not None else None
+
+    def __len__(self):
+        return len(self._fill())
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index >= len(self._items) and not self._pull():
+                return
+            yield self._items[index]
+            index += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyStorage(self._fill()[index])
+        if index >= 0:
+            while index >= len(self._items) and self._pull():
+                pass
+            return self._items[index]
+        return self._fill()[index]
+
+    def __setitem__(self, index, value):
+        self._fill()[index] = value
+
+    def __delitem__(self, index):
+        del self._fill()[index]
+
+    def _pull(self) -> bool:
+        if self._source is None:
+            return False
+        for element in self._source:
+            self._items.append(element)
+            return True
+        self._source = None
+        return False
+
+    def _fill(self) -> list:
+        if self._source is not None:
+            self._items.extend(self._source)
+            self._source = None
+        return self._items
+
+    @property
+    def evaluated(self) -> bool:
+        '''
+        Has the underlying iterator been consumed
+        '''
+
+        return self._source is None
+
+    def insert(self, index: int, value) -> None:
+        self._fill().insert(index, value)
+
+    def append(self, value) -> None:
+        self._fill().append(value)
+
+    def reverse(self) -> None:
+        self._fill().reverse()
+
+    def sort(self, reverse: bool = False) -> None:
+        self._fill().sort(reverse=reverse)
+
+    def copy(self) -> 'LazyStorage':
+        return LazyStorage(list(self._fill()))
+
+    def to_list(self) -> list:
+        return list(self._fill())
+
+
+class CategoricalStorage(Storage):
+    '''
+    Dictionary encoded storage for collections of repeated hashable
+    values.  Each distinct value is kept once in a code table and the
+    collection is stored as an array of integer codes, widened as the
+    table grows.  Values that are equal but of different types, such as
+    1, True and 1.0, get codes of their own and are matched together
+    '''
+
+    _typecodes = (('B', 1 << 8), ('H', 1 << 16), ('I', 1 << 32))
+
+    def __init__(self, data: Iterable = None):
+        self._categories = list()
+        self._lookup = dict()
+        self._equal = dict()
+        self._counts = list()
+        self._codes = array('B')
+
+        if data is not None:
+            self.extend(data)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __iter__(self):
+        return map(self._categories.__getitem__, self._codes)
+
+    def __contains__(self, value):
+        return bool(self._matching(value))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._derive(self._codes[index])
+        return self._categories[self._codes[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self._reset(items)
+        else:
+            previous = self._codes[index]
+            code = self._encode(value)
+            self._release(previous)
+            self._codes[index] = code
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            for code in self._codes[index]:
+                self._release(code)
+        else:
+            self._release(self._codes[index])
+        del self._codes[index]
+
+    def _widen(self) -> None:
+        for typecode, limit in self._typecodes:
+            if len(self._categories) <= limit:
+                break
+        if typecode != self._codes.typecode:
+            self._codes = array(typecode, self._codes)
+
+    def _encode(self, value) -> int:
+        key = type(value), value
+        code = self._lookup.get(key)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(value)
+            self._counts.append(0)
+            self._lookup[key] = code
+            self._equal.setdefault(value, []).append(code)
+            self._widen()
+        self._counts[code] += 1
+        return code
+
+    def _release(self, code: int) -> None:
+        self._counts[code] -= 1
+
+    def _live(self, codes: list) -> list:
+        return [code for code in codes if self._counts[code]]
+
+    def _matching(self, value) -> list:
+        try:
+            return self._live(self._equal.get(value, ()))
+        except TypeError:
+            return []
+
+    def _derive(self, codes: array) -> 'CategoricalStorage':
+        derived = CategoricalStorage()
+        derived._categories = list(self._categories)
+        derived._lookup = dict(self._lookup)
+        derived._equal = {x: list(y) for x, y in self._equal.items()}
+        derived._codes = codes
+        counts = Counter(codes)
+        derived._counts = [counts[x] for x in range(len(self._categories))]
+        return derived
+
+    def _reset(self, items: Iterable) -> None:
+        self.__init__(items)
+
+    def _used(self) -> list:
+        return [code for code, count in enumerate(self._counts) if count]
+
+    @property
+    def categories(self) -> list:
+        '''
+        The distinct values in the collection, in the order they
+        were first encoded
+        '''
+
+        return [self._categories[x] for x in self._used()]
+
+    @property
+    def codes(self) -> array:
+        '''
+        The integer code of each element in the collection
+        '''
+
+        return self._codes
+
+    def unique(self) -> list:
+        '''
+        The distinct values in the collection, in the order they first
+        occur in it
+        '''
+
+        return list(map(self._categories.__getitem__,
+                        dict.fromkeys(self._codes)))
+
+    def append(self, value) -> None:
+        code = self._encode(value)
+        self._codes.append(code)
+
+    def extend(self, values: Iterable) -> None:
+        for value in values:
+            self.append(value)
+
+    def insert(self, index: int, value) -> None:
+        code = self._encode(value)
+        self._codes.insert(index, code)
+
+    def remove(self, value) -> None:
+        del self[self.index(value)]
+
+    def index(self, value, *args) -> int:
+        found = list()
+        for code in self._matching(value):
+            try:
+                found.append(self._codes.index(code, *args))
+            except ValueError:
+                pass
+        if not found:
+            raise ValueError(f'{value!r} is not in storage')
+        return min(found)
+
+    def count(self, value) -> int:
+        return sum(self._counts[x] for x in self._matching(value))
+
+    def reverse(self) -> None:
+        self._codes.reverse()
+
+    def sort(self, reverse: bool = False) -> None:
+        if len(self._equal) < len(self._categories):
+            # equal values of different types keep their order
+            self._codes = array(self._codes.typecode, sorted(
+                self._codes, key=self._categories.__getitem__,
+                reverse=reverse))
+            return
+
+        order = sorted(
+            self._used(),
+            key=self._categories.__getitem__,
+            reverse=reverse)
+
+        codes = array(self._codes.typecode)
+        for code in order:
+            codes.extend(array(codes.typecode, [code]) * self._counts[code])
+        self._codes = codes
+
+    def copy(self) -> 'CategoricalStorage':
+        return self._derive(array(self._codes.typecode, self._codes))
+
+    def distinct(self) -> 'CategoricalStorage':
+        return CategoricalStorage(
+            self._categories[x[0]]
+            for x in map(self._live, self._equal.values()) if x)
+
+    def count_distinct(self) -> int:
+        return sum(1 for x in self._equal.values() if self._live(x))
+
+
+_absent = object()
+
+
+def _compact(values: list) -> Sequence:
+    '''
+    Store a column in the most compact form its values allow: a typed
+    array for ints or floats, dictionary encoding for repeated strings
+    and a plain list otherwise
+    '''
+
+    if values and all(type(x) is int for x in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if values and all(type(x) is float for x in values):
+        return array('d', values)
+    if values and all(type(x) is str for x in values) and \
+            len(set(values)) <= len(values) // 2:
+        return CategoricalStorage(values)
+    return values
+
+
+def _accepts(column: Sequence, value) -> bool:
+    if isinstance(column, array):
+        return _typecode(value) == column.typecode
+    if isinstance(column, CategoricalStorage):
+        return type(value) is str
+    return True
+
+
+def _gather(column: Sequence, indices: list) -> Sequence:
+    if isinstance(column, array):
+        return array(column.typecode, map(column.__getitem__, indices))
+    if isinstance(column, CategoricalStorage):
+        codes = column.codes
+        return column._derive(
+            array(codes.typecode, map(codes.__getitem__, indices)))
+    return list(map(column.__getitem__, indices))
+
+
+class _Field:
+    '''
+    Stand in for a field value.  Any use of it other than returning it
+    raises, so functions that inspect values are not taken for
+    projections
+    '''
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def _inspect(self, *args):
+        raise TypeError('Field values cannot be inspected while probing')
+
+    __bool__ = __eq__ = __ne__ = __hash__ = _inspect
+    __len__ = __iter__ = __contains__ = _inspect
+
+
+class _Probe:
+    '''
+    Stand in for a row that records which field a function projects
+    '''
+
+    def __getitem__(self, key):
+        return _Field(key)
+
+    def get(self, key, default=None):
+        return _Field(key)
+
+
+class _Cursor(Mapping):
+    '''
+    Read only row over the columns at a movable index
+    '''
+
+    __slots__ = ('_storage', '_columns', 'index')
+
+    def __init__(self, storage: 'ColumnarStorage'):
+        self._storage = storage
+        self._columns = storage._columns
+        self.index = 0
+
+    def __getitem__(self, key):
+        value = self._columns[key][self.index]
+        if value is _absent:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return iter(self._storage.row(self.index))
+
+    def __len__(self):
+        return len(self._storage.row(self.index))
+
+
+class ColumnarStorage(Storage):
+    '''
+    Struct of arrays storage for collections of dict records.  Each
+    field is stored as its own column, typed where its values allow,
+    and rows are only rebuilt as dicts when they are read
+    '''
+
+    def __init__(self, data: Iterable = None):
+        self._fields = list()
+        self._columns = dict()
+        self._length = 0
+
+        rows = list(data) if data is not None else list()
+        values = dict()
+        for index, row in enumerate(rows):
+            for field in row:
+                if field not in values:
+                    self._fields.append(field)
+                    values[field] = [_absent] * index
+            for field, column in values.items():
+                column.append(row.get(field, _absent))
+
+        self._columns = {x: _compact(values[x]) for x in self._fields}
+        self._length = len(rows)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        fields = self._fields
+        if not fields:
+            for _ in range(self._length):
+                yield dict()
+            return
+
+        for values in zip(*[self._columns[x] for x in fields]):
+            yield {field: value for field, value in zip(fields, values)
+                   if value is not _absent}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(self._length)[index])
+        if not -self._length <= index < self._length:
+            raise IndexError('storage index out of range')
+        return self.row(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            rows = list(self)
+            rows[index] = value
+            self.__init__(rows)
+            return
+
+        index = range(self._length)[index]
+        for field in self._row_fields(value):
+            element = value.get(field, _absent)
+            self._writable(field, element)[index] = element
+
+    def __delitem__(self, index):
+        removed = range(self._length)[index]
+        for column in self._columns.values():
+            del column[index]
+        self._length -= len(removed) if isinstance(index, slice) else 1
+
+    def _row_fields(self, row: dict) -> list:
+        return self._fields + [x for x in row if x not in self._columns]
+
+    def _writable(self, field, value) -> Sequence:
+        column = self._columns.get(field)
+        if column is None:
+            self._fields.append(field)
+            column = self._columns[field] = [_absent] * self._length
+        elif not _accepts(column, value):
+            column = self._columns[field] = list(column)
+        return column
+
+    @property
+    def fields(self) -> list:
+        '''
+        The field names in the order they were first seen
+        '''
+
+        return list(self._fields)
+
+    def row(self, index: int) -> dict:
+        '''
+        Rebuild the row at the given index
+        '''
+
+        row = dict()
+        for field in self._fields:
+            value = self._columns[field][index]
+            if value is not _absent:
+                row[field] = value
+        return row
+
+    def column(self, field) -> Sequence:
+        '''
+        Gets a copy of a column as a list, or as categorical storage
+        for dictionary encoded columns.  Rows missing the field read
+        as None
+        '''
+
+        column = self._columns[field]
+        if isinstance(column, CategoricalStorage):
+            return column.copy()
+        return [None if x is _absent else x for x in column]
+
+    def columns(self) -> dict:
+        '''
+        Gets a copy of every column by field name
+        '''
+
+        return {x: self.column(x) for x in self._fields}
+
+    def projection(self, func: Callable):
+        '''
+        Gets the field func projects, if func only reads one field of
+        a row and that field is present in every row, else None.  func
+        is called once with a placeholder row to find out, so functions
+        with side effects see one extra call
+        '''
+
+        try:
+            field = func(_Probe())
+        except Exception:
+            return None
+
+        if not isinstance(field, _Field) or field.name not in self._columns:
+            return None
+        column = self._columns[field.name]
+        if not isinstance(column, (array, CategoricalStorage)) and \
+                any(x is _absent for x in column):
+            return None
+        return field.name
+
+    def filter(self, func: Callable) -> 'ColumnarStorage':
+        '''
+        Gets the rows where func is true.  func is given a read only
+        mapping over the columns, so rows are not rebuilt as dicts
+        '''
+
+        cursor = _Cursor(self)
+        indices = list()
+        for index in range(self._length):
+            cursor.index = index
+            if func(cursor):
+                indices.append(index)
+        return self.take(indices)
+
+    def take(self, indices: Iterable) -> 'ColumnarStorage':
+        '''
+        Gets the rows at the given indices
+        '''
+
+        indices = list(indices)
+        taken = ColumnarStorage()
+        taken._fields = list(self._fields)
+        taken._columns = {x: _gather(self._columns[x], indices)
+                          for x in self._fields}
+        taken._length = len(indices)
+        return taken
+
+    def insert(self, index: int, value) -> None:
+        index = min(max(index + self._length if index < 0 else index, 0),
+                    self._length)
+        for field in self._row_fields(value):
+            element = value.get(field, _absent)
+            self._writable(field, element).insert(index, element)
+        self._length += 1
+
+    def append(self, value) -> None:
+        for field in self._row_fields(value):
+            element = value.get(field, _absent)
+            self._writable(field, element).append(element)
+        self._length += 1
+
+    def reverse(self) -> None:
+        for column in self._columns.values():
+            column.reverse()
+
+    def copy(self) -> 'ColumnarStorage':
+        return self.take(range(self._length))
+
+
+def _typecode(value) -> Union[str, None]:
+    if type(value) is float:
+        return 'd'
+    if type(value) is int and -1 << 63 <= value < 1 << 63:
+        return 'q'
+    return None
+
+
+class AdaptiveStorage(Storage):
+    '''
+    Storage that picks its representation from the operations it
+    receives.  Elements start in a list and move to a deque when the
+    head is popped often, and a hash index is attached when membership
+    probes are frequent.  Operations are counted with exponential decay
+    and reviewed every window operations, a change has to be indicated
+    by consecutive reviews before it is applied, and every switch is
+    reported to on_switch, or to debug_hook when no on_switch is given.
+    Probes without an index scan the collection and head pops from a
+    list shift it, so the index or deque is adopted early once
+    index_rent probes or deque_rent pops are made within one window,
+    about what building it costs
+
+    The element types are tallied as they are written, so numeric
+    aggregates check the collection in constant time.  A backend can
+    be pinned instead, e.g. backend='array' to keep homogeneous numbers
+    in a compact typed array, which falls back to a list once an element
+    of another type is written
+    '''
+
+    window = 256
+    patience = 2
+    enter_share = 0.05
+    leave_share = 0.01
+    index_rent = 4
+    deque_rent = 24
+    debug_hook = None
+    backends = ('list', 'deque', 'array')
+    operations = ('head', 'membership', 'range', 'aggregate')
+
+    def __init__(self, data: Iterable = None, on_switch: Callable = None,
+                 backend: str = None):
+        self._backend = list(data) if data is not None else list()
+        self._kind = 'list'
+        self._index = None
+        self._ops = dict.fromkeys(self.operations, 0)
+        self._left = self.window
+        self._counted = 0
+        self._pending = None
+        self._streak = 0
+        self._scans = self._shifts = 0
+        self.on_switch = on_switch
+        self._recount()
+
+        if backend is not None:
+            kind, _, indexed = backend.partition('+')
+            if kind not in self.backends or indexed not in ('', 'index'):
+                raise ValueError(
+                    f'Backend is not of valid types '
+                    f'{", ".join(self.backends)}, optionally +index')
+            if kind == 'array' and self._numeric_typecode() is None:
+                raise ValueError(
+                    'Array backend needs elements that are all ints or '
+                    'all floats')
+            self._switch(kind, bool(indexed), 'pinned')
+            self._ops = None
+
+    def __len__(self):
+        return len(self._backend)
+
+    def __iter__(self):
+        return iter(self._backend)
+
+    def __contains__(self, value):
+        # probes only count down the window, _counts attributes the
+        # operations no other counter took to them
+        if self._ops is not None:
+            self._left -= 1
+            if not self._left:
+                self._review()
+            elif self._index is None:
+                self._scans += 1
+                if self._scans >= self.index_rent:
+                    self._scans = 0
+                    self._switch(self._kind, True, 'membership cost')
+        index = self._index
+        if index is not None:
+            try:
+                return value in index
+            except TypeError:
+                pass
+        return value in self._backend
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self._backend[index]
+
+        self._observe('range')
+        if self._kind == 'deque' and index.step is None and \
+                (index.start or 0) >= 0 and (index.stop or 0) >= 0:
+            stop = index.stop if index.stop is not None else len(self)
+            return AdaptiveStorage(islice(self._backend, index.start, stop))
+        if self._kind == 'deque':
+            return AdaptiveStorage(list(self._backend)[index])
+        return AdaptiveStorage(self._backend[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = list(self._backend)
+            items[index] = value
+            self._load(items)
+            return
+
+        previous = self._backend[index]
+        self._fit(value)
+        self._backend[index] = value
+        self._forget(previous)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            items = list(self._backend)
+            del items[index]
+            self._load(items)
+            return
+
+        if index == 0 or index == -len(self._backend):
+            # _observe inlined, as for membership probes
+            ops = self._ops
+            if ops is not None:
+                ops['head'] += 1
+                self._left -= 1
+                if not self._left:
+                    self._review()
+                elif self._kind == 'list':
+                    self._shifts += 1
+                    if self._shifts >= self.deque_rent:
+                        self._shifts = 0
+                        self._switch(
+                            'deque', self._index is not None, 'head cost')
+            if self._kind == 'deque':
+                self._forget(self._backend.popleft())
+                return
+
+        previous = self._backend[index]
+        del self._backend[index]
+        self._forget(previous)
+
+    def _observe(self, operation: str) -> None:
+        if self._ops is None:
+            return
+
+        self._ops[operation] += 1
+        self._left -= 1
+        if not self._left:
+            self._review()
+
+    def _counts(self) -> dict:
+        counts = dict(self._ops)
+        counts['membership'] += self.window - self._left - (
+            sum(counts.values()) - self._counted)
+        return counts
+
+    def _share(self, operation: str, active: bool) -> bool:
+        total = sum(self._ops.values()) or 1
+        threshold = self.leave_share if active else self.enter_share
+        return self._ops[operation] / total >= threshold
+
+    def _review(self) -> None:
+        self._ops = self._counts()
+        kind = 'list'
+        if self._share('head', self._kind == 'deque') and \
+                self._ops['head'] >= self._ops['range']:
+            kind = 'deque'
+        indexed = self._share('membership', self._index is not None)
+
+        for operation in self.operations:
+            self._ops[operation] //= 2
+        self._counted = sum(self._ops.values())
+        self._left = self.window
+        self._scans = self._shifts = 0
+
+        target = (kind, indexed)
+        if target == (self._kind, self._index is not None):
+            self._pending, self._streak = None, 0
+            return
+        if target != self._pending:
+            self._pending, self._streak = target, 0
+        self._streak += 1
+        if self._streak >= self.patience:
+            self._pending, self._streak = None, 0
+            self._switch(kind, indexed, 'operation mix')
+
+    def _switch(self, kind: str, indexed: bool, reason: str) -> None:
+        previous = self.backend
+        items = self._backend
+        if kind == 'deque':
+            self._backend = deque(items)
+        elif kind == 'array':
+            self._backend = array(self._numeric_typecode(), items)
+        else:
+            self._backend = list(items)
+        self._kind = kind
+
+        self._index = None
+        if indexed:
+            try:
+                self._index = Counter(self._backend)
+            except TypeError:
+                pass
+
+        hook = self.on_switch or type(self).debug_hook
+        if hook is not None and previous != self.backend:
+            counts = self._counts() if self._ops is not None else dict()
+            hook(previous, self.backend, reason, counts)
+
+    def _recount(self) -> None:
+        self._typed = dict.fromkeys(('q', 'd', None), 0)
+        for typecode in map(_typecode, self._backend):
+            self._typed[typecode] += 1
+        self._numbers = sum(
+            isinstance(x, (int, float)) for x in self._backend)
+
+    def _numeric_typecode(self) -> Union[str, None]:
+        for typecode in ('q', 'd'):
+            if self._typed[typecode] == len(self._backend) > 0:
+                return typecode
+        return None
+
+    def _load(self, items: list) -> None:
+        kind = self._kind
+        self._backend = items
+        self._kind = 'list'
+        self._recount()
+        if kind == 'array' and self._numeric_typecode() is None:
+            kind = 'list'
+        self._switch(kind, self._index is not None, 'reload')
+
+    def _fit(self, value) -> None:
+        typecode = _typecode(value)
+        self._typed[typecode] += 1
+        self._numbers += isinstance(value, (int, float))
+
+        if self._kind == 'array' and typecode != self._backend.typecode:
+            self._switch('list', self._index is not None, 'element type')
+
+        if self._index is not None:
+            try:
+                self._index[value] += 1
+            except TypeError:
+                self._switch(self._kind, False, 'unhashable element')
+
+    def _forget(self, value) -> None:
+        self._typed[_typecode(value)] -= 1
+        self._numbers -= isinstance(value, (int, float))
+
+        if self._index is not None:
+            self._index[value] -= 1
+            if not self._index[value]:
+                del self._index[value]
+
+    @property
+    def backend(self) -> str:
+        '''
+        The current representation, e.g. list, deque or array, with
+        +index when a hash index is attached
+        '''
+
+        return self._kind + ('+index' if self._index is not None else '')
+
+    def numeric(self) -> bool:
+        self._observe('aggregate')
+        return self._numbers == len(self._backend)
+
+    def insert(self, index: int, value) -> None:
+        self._fit(value)
+        self._backend.insert(index, value)
+
+    def append(self, value) -> None:
+        self._fit(value)
+        self._backend.append(value)
+
+    def remove(self, value) -> None:
+        del self[self._backend.index(value)]
+
+    def index(self, value, *args) -> int:
+        return self._backend.index(value, *args)
+
+    def count(self, value) -> int:
+        if self._index is not None:
+            try:
+                return self._index.get(value, 0)
+            except TypeError:
+                pass
+        return self._backend.count(value)
+
+    def reverse(self) -> None:
+        self._backend.reverse()
+
+    def sort(self, reverse: bool = False) -> None:
+        self._load(sorted(self._backend, reverse=reverse))
+
+    def copy(self) -> 'AdaptiveStorage':
+        return AdaptiveStorage(self._backend, self.on_switch,
+                               self.backend if self._ops is None else None)
@@ -0,0 +1,153 @@
+from abc import ABCMeta, abstractmethod
+from typing import Callable
+from weakref import WeakMethod
+
+from dotlist.collections import DotListException, Mutation, dotlist
+
+
+def _read_only(self, *args, **kwargs):
+    raise DotListException(
+        message='Views are read only, mutate the source collection')
+
+
+class dotlist_view(dotlist, metaclass=ABCMeta):
+    '''
+    Read only dotlist derived from a source collection and patched
+    incrementally as the source is mutated.  Views can be viewed in
+    turn, and stop following the source once detached.  The source
+    only holds a weak reference to its views, so a view that is no
+    longer referenced is released and stops being patched
+    '''
+
+    def __init__(self, source: dotlist, func: Callable):
+        super().__init__()
+        self._source = source
+        self._func = func
+
+        self._rebuild()
+        self._update_attributes()
+        self._subscription = WeakMethod(self._on_mutation)
+        source._subscribers.append(self._subscription)
+
+    @abstractmethod
+    def _rebuild(self) -> None:
+        pass
+
+    def _on_mutation(self, mutation: Mutation, index: int,
+                     value: object) -> None:
+        if mutation == Mutation.Reset:
+            self._rebuild()
+            self._notify(Mutation.Reset)
+        else:
+            self._patch(mutation, index, value)
+        self._update_attributes()
+
+    @abstractmethod
+    def _patch(self, mutation: Mutation, index: int,
+               value: object) -> None:
+        pass
+
+    def _view_insert(self, index: int, value: object) -> None:
+        self._collection.insert(index, value)
+        self._track([value])
+        self._notify(Mutation.Insert, index, value)
+
+    def _view_remove(self, index: int) -> None:
+        del self._collection[index]
+        self._notify(Mutation.Remove, index)
+
+    def _view_set(self, index: int, value: object) -> None:
+        self._collection[index] = value
+        self._track([value])
+        self._notify(Mutation.Set, index, value)
+
+    @property
+    def attached(self) -> bool:
+        '''
+        Is the view following its source collection
+        '''
+
+        return self._source is not None
+
+    def detach(self) -> None:
+        '''
+        Stop following the source collection.  The view keeps its
+        current elements
+        '''
+
+        if self._source is not None:
+            self._source._subscribers.remove(self._subscription)
+            self._source = None
+
+    add = _read_only
+    remove = _read_only
+    insert = _read_only
+    reverse = _read_only
+    sort = _read_only
+    apply = _read_only
+    shave_first = _read_only
+    shave_last = _read_only
+    union = _read_only
+    __setitem__ = _read_only
+
+
+class where_view(dotlist_view):
+    '''
+    View of the elements of a source collection where func is true
+    '''
+
+    def _rebuild(self) -> None:
+        self._matches = [bool(self._func(x)) for x in self._source]
+        self._collection = [
+            x for x, match in zip(self._source, self._matches) if match]
+        self._track(self._collection)
+
+    def _position(self, index: int) -> int:
+        if index == len(self._matches):
+            return len(self._collection)
+        if index == len(self._matches) - 1:
+            return len(self._collection) - self._matches[index]
+        return sum(self._matches[:index])
+
+    def _patch(self, mutation: Mutation, index: int,
+               value: object) -> None:
+        position = self._position(index)
+
+        if mutation == Mutation.Insert:
+            match = bool(self._func(value))
+            self._matches.insert(index, match)
+            if match:
+                self._view_insert(position, value)
+
+        elif mutation == Mutation.Remove:
+            if self._matches.pop(index):
+                self._view_remove(position)
+
+        elif mutation == Mutation.Set:
+            match = bool(self._func(value))
+            matched, self._matches[index] = self._matches[index], match
+            if matched and match:
+                self._view_set(position, value)
+            elif matched:
+                self._view_remove(position)
+            elif match:
+                self._view_insert(position, value)
+
+
+class select_view(dotlist_view):
+    '''
+    View of the results of func over a source collection
+    '''
+
+    def _rebuild(self) -> None:
+        self._collection = [self._func(x) for x in self._source]
+        self._track(self._collection)
+
+    def _patch(self, mutation: Mutation, index: int,
+               value: object) -> None:
+        if mutation == Mutation.Insert:
+            self._view_insert(index, self._func(value))
+        elif mutation == Mutation.Remove:
+            self._view_remove(index)
+        elif mutation == Mutation.Set:
+            self._view_set(index, self._func(value))
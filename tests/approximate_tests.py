@@ -0,0 +1,93 @@
+from decimal import Decimal
+from fractions import Fraction
+from math import sqrt
+from statistics import mean
+
+import pytest
+
+from dotlist import BloomFilter, HyperLogLog, dotlist
+
+
+def _errors(precision, size, seeds):
+    errors = list()
+    for seed in range(seeds):
+        counter = HyperLogLog(precision)
+        counter.update(f'{seed}-{x}' for x in range(size))
+        errors.append(counter.count() / size - 1)
+    return errors
+
+
+@pytest.mark.parametrize('precision, size', [
+    (10, 100), (10, 1000), (10, 2600), (10, 4000), (10, 5000),
+    (10, 50000), (14, 42000)])
+def test_hyperloglog_error_within_bound(precision, size):
+    seeds = 8
+    error = HyperLogLog(precision).error
+    errors = _errors(precision, size, seeds)
+
+    assert all(abs(x) < 4 * error for x in errors)
+    assert abs(mean(errors)) < 3 * error / sqrt(seeds)
+
+
+def test_hyperloglog_empty():
+    assert HyperLogLog().count() == 0
+
+
+def test_hyperloglog_merge_and_serialize():
+    left, right = HyperLogLog(12), HyperLogLog(12)
+    left.update(range(0, 6000))
+    right.update(range(3000, 9000))
+
+    restored = HyperLogLog.from_bytes(left.to_bytes())
+    assert restored.count() == left.count()
+
+    restored.merge(right)
+    assert abs(restored.count() / 9000 - 1) < 4 * restored.error
+
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_count_distinct_approx():
+    collection = dotlist([x % 5000 for x in range(20000)])
+
+    estimate = collection.count_distinct(approx=True, precision=12)
+    assert abs(estimate / 5000 - 1) < 4 * HyperLogLog(12).error
+
+
+def test_bloom_false_positive_rate():
+    bloom = BloomFilter(10000, 0.01)
+    bloom.update(range(10000))
+
+    assert all(x in bloom for x in range(10000))
+    false_positives = sum(x in bloom for x in range(10000, 30000))
+    assert false_positives / 20000 < 1.5 * bloom.error_rate
+
+
+def test_bloom_merge_and_serialize():
+    left, right = BloomFilter(1000), BloomFilter(1000)
+    left.update(['howdy', 'there'])
+    right.update(['world'])
+
+    restored = BloomFilter.from_bytes(left.to_bytes())
+    restored.merge(right)
+    assert all(x in restored for x in ('howdy', 'there', 'world'))
+    assert len(restored) == 3
+
+
+def test_bloom_has_equal_numbers_of_other_types():
+    collection = dotlist([Decimal(1), 2 + 0j, 0.5, Fraction(1, 3), 4])
+    collection.attach_bloom()
+
+    assert collection.has([1, complex(2, 0), Decimal('0.5'), Fraction(2, 6)])
+    assert collection.has([True, 2.0, 4.0, Decimal(4)])
+    assert collection.nas(3)
+
+
+def test_bloom_tracks_added_elements():
+    collection = dotlist(['howdy'])
+    collection.attach_bloom(capacity=4)
+    collection.add(['there', 'world', 'again', 'more'])
+
+    assert collection.has(['howdy', 'there', 'world', 'again', 'more'])
+    assert collection.nas('missing')
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from dotlist import BitmapStorage, RoaringBitmap, dotlist
+
+
+@pytest.fixture
+def ids():
+    rng = random.Random(3)
+    sparse = rng.sample(range(1 << 24), 3000)
+    dense = list(range(70000, 75000))
+    return sorted(set(sparse + dense + [0, 65535, 65536]))
+
+
+def test_roaring_bitmap_matches_set(ids):
+    other = list(range(60000, 140000, 3))
+    bitmap, compare = RoaringBitmap(ids), RoaringBitmap(other)
+
+    assert list(bitmap) == ids
+    assert len(bitmap) == len(ids)
+    assert list(bitmap & compare) == sorted(set(ids) & set(other))
+    assert list(bitmap | compare) == sorted(set(ids) | set(other))
+    assert list(bitmap - compare) == sorted(set(ids) - set(other))
+    assert all(bitmap.select(bitmap.rank(x) - 1) == x for x in ids[::97])
+
+
+def test_roaring_bitmap_n_way(ids):
+    sets = [RoaringBitmap(range(x, 100000, x + 2)) for x in range(1, 5)]
+
+    assert list(RoaringBitmap(ids).intersection(*sets)) == sorted(
+        set(ids).intersection(*[set(x) for x in sets]))
+    assert list(sets[0].union(*sets[1:])) == sorted(
+        set().union(*[set(x) for x in sets]))
+
+
+def test_roaring_bitmap_serialization(ids):
+    bitmap = RoaringBitmap(ids)
+    bitmap.run_optimize()
+
+    assert RoaringBitmap.from_bytes(bitmap.to_bytes()) == bitmap
+    with pytest.raises(ValueError):
+        RoaringBitmap.from_bytes(b'nope' + bytes(4))
+
+
+def test_roaring_bitmap_rejects_non_ids():
+    with pytest.raises(TypeError):
+        RoaringBitmap(['x'])
+    with pytest.raises(ValueError):
+        RoaringBitmap([-1])
+
+
+def test_bitmap_collection_set_operations():
+    collection = dotlist([5, 1, 3, 3], storage='bitmap')
+
+    assert collection.to_list() == [1, 3, 5]
+    assert collection.count == 3
+    assert collection.count_distinct() == 3
+    assert collection.has([1, 5]) and collection.nas(2)
+    assert collection.intersection([3, 5, 7], [5, 3]).to_list() == [3, 5]
+    assert collection.difference([1, 2, 4]).to_list() == [2, 4]
+
+    collection.union([7, 1], dotlist([9], storage='bitmap'))
+    assert collection.to_list() == [1, 3, 5, 7, 9]
+    assert collection.count == 5
+
+
+def test_bitmap_compare_with_other_elements():
+    collection = dotlist([1, 2, 3], storage='bitmap')
+
+    assert collection.intersection(['x', 2, -1, 2.5]).to_list() == [2]
+    assert collection.difference(['x', 2, 9]).to_list() == ['x', 9]
+    with pytest.raises(TypeError):
+        collection.union(['x'])
+
+
+def test_bitmap_apply_rebuilds():
+    collection = dotlist([1, 2, 3], storage='bitmap')
+
+    collection.apply(lambda x: x + 10)
+    assert collection.to_list() == [11, 12, 13]
+
+    collection.apply(lambda x: x // 2)
+    assert collection.to_list() == [5, 6]
+    assert collection.count == 2
+
+
+def test_bitmap_index_assignment_is_rejected():
+    storage = BitmapStorage([1, 2, 3])
+
+    with pytest.raises(TypeError):
+        storage[0] = 10
+    with pytest.raises(TypeError):
+        storage.reverse()
+
+    storage[1:] = [20, 10]
+    assert list(storage) == [1, 10, 20]
+
+
+def test_bitmap_views_follow_inserts():
+    collection = dotlist([1, 2, 3], storage='bitmap')
+    selected = collection.view_select(lambda x: x)
+    evens = collection.view_where(lambda x: x % 2 == 0)
+
+    collection.add(2)
+    collection.add(0)
+    collection.insert(8, 0)
+    collection.add([5, 5, 4])
+    collection.remove(1)
+    collection.shave_first()
+
+    assert selected.to_list() == collection.to_list() == [2, 3, 4, 5, 8]
+    assert evens.to_list() == [2, 4, 8]
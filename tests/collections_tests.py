@@ -1 +1,91 @@
-# TODO: Test coverage
+from collections import Counter
+from operator import add, mul
+
+import pytest
+
+from dotlist import concurrent_dotlist, dotlist
+from dotlist.collections import DotListException
+
+
+def _merge(left, right):
+    return left + right
+
+
+def test_reduce():
+    collection = dotlist([1, 2, 3, 4])
+
+    assert collection.reduce(mul) == 24
+    assert collection.reduce(add, 10) == 20
+    assert collection.reduce(lambda x, y: x - y) == -8
+    assert dotlist().reduce(add) is None
+    assert dotlist().reduce(add, 0) == 0
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_associative_reduce_matches_sequential(executor):
+    collection = dotlist([Counter({x % 7: 1}) for x in range(5000)])
+
+    expected = collection.reduce(_merge)
+    parallel = collection.reduce(
+        _merge, associative=True, executor=executor, workers=3,
+        chunk_size=100)
+
+    assert parallel == expected
+    assert collection.reduce(
+        _merge, Counter({'start': 1}), associative=True,
+        executor=executor, workers=2)['start'] == 1
+
+
+def test_reduce_rejects_unknown_executor():
+    with pytest.raises(DotListException):
+        dotlist([1, 2]).reduce(add, associative=True, executor='gpu')
+
+
+def test_fold():
+    collection = dotlist(['howdy', 'there'])
+
+    assert collection.fold(lambda total, x: total + len(x), 0) == 10
+    assert dotlist().fold(add, 'empty') == 'empty'
+
+
+def test_scan():
+    collection = dotlist([1, 2, 3, 4])
+
+    assert collection.scan().to_list() == [1, 3, 6, 10]
+    assert collection.scan(mul, 1).to_list() == [1, 1, 2, 6, 24]
+    assert collection.accumulate(max).to_list() == [1, 2, 3, 4]
+    assert dotlist().scan().to_list() == []
+
+
+def test_scan_is_lazy():
+    calls = list()
+    scanned = dotlist([1, 2, 3, 4]).scan(
+        lambda x, y: calls.append(y) or x + y)
+
+    assert scanned.first_or_none() == 1
+    assert calls == []
+    assert scanned.at(2) == 6
+    assert calls == [2, 3]
+    assert scanned.count == 4
+    assert calls == [2, 3, 4]
+
+
+def test_scan_ignores_later_mutations():
+    collection = dotlist([1, 2, 3])
+    scanned = collection.scan()
+
+    collection[0] = 100
+    collection.add(4)
+
+    assert scanned.to_list() == [1, 3, 6]
+    assert scanned.count == 3
+
+
+def test_reductions_see_buffered_adds():
+    collection = concurrent_dotlist([1, 2], batch_size=100)
+    collection.add([3, 4])
+
+    assert collection.reduce(add) == collection.sum() == 10
+    assert collection.fold(add, 0) == 10
+    assert collection.scan().to_list() == [1, 3, 6, 10]
+    assert collection.accumulate().to_list() == [1, 3, 6, 10]
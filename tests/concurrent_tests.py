@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+
+from dotlist import concurrent_dotlist
+
+
+def _run(threads):
+    for thread in threads:
+        thread.start()
+    _join(threads)
+
+
+def _join(threads):
+    for thread in threads:
+        thread.join(timeout=60)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+@pytest.mark.parametrize('writers', [1, 2, 4, 8, 16, 32])
+def test_concurrent_adds_are_not_lost(writers):
+    per_writer = 2000
+    collection = concurrent_dotlist(batch_size=64)
+    failures = list()
+    done = threading.Event()
+
+    def write(writer):
+        for index in range(per_writer):
+            collection.add([(writer, index)])
+
+    def read():
+        previous = 0
+        while not done.is_set():
+            snapshot = collection.snapshot()
+            size = len(snapshot)
+            if size < previous:
+                failures.append(f'snapshot shrank from {previous} to {size}')
+            previous = size
+
+            positions = dict()
+            for writer, index in snapshot:
+                if positions.get(writer, -1) != index - 1:
+                    failures.append(f'writer {writer} out of order')
+                    return
+                positions[writer] = index
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    _run([threading.Thread(target=write, args=(x,)) for x in range(writers)])
+    done.set()
+    _join(readers)
+
+    assert not failures
+    collection.flush()
+    assert collection.count == writers * per_writer
+    for writer in range(writers):
+        assert collection.where(lambda x: x[0] == writer).to_list() == [
+            (writer, x) for x in range(per_writer)]
+
+
+@pytest.mark.parametrize('threads', [1, 4, 32])
+def test_concurrent_shaves_are_atomic(threads):
+    collection = concurrent_dotlist(list(range(threads * 200)))
+
+    def shave(first):
+        for _ in range(100):
+            if first:
+                collection.shave_first()
+            else:
+                collection.shave_last()
+
+    _run([threading.Thread(target=shave, args=(x % 2 == 0,))
+          for x in range(threads)])
+
+    remaining = collection.to_list()
+    assert len(remaining) == threads * 100
+    assert remaining == list(range(remaining[0], remaining[0] + len(remaining)))
+
+
+def test_reads_see_own_buffered_adds():
+    collection = concurrent_dotlist([1, 2], batch_size=1000)
+    collection.attach_bloom()
+    collection.add([3, 4])
+
+    assert collection.sum() == 10
+    assert collection.has(4)
+    assert collection.count == 4
+
+
+def test_reads_do_not_wait_for_writers():
+    collection = concurrent_dotlist([1, 2, 3])
+    applying, release = threading.Event(), threading.Event()
+
+    def slow(value):
+        applying.set()
+        release.wait(timeout=30)
+        return value * 10
+
+    writer = threading.Thread(target=collection.apply, args=(slow,))
+    writer.start()
+    assert applying.wait(timeout=30)
+
+    results = list()
+    reader = threading.Thread(target=lambda: results.append(collection.sum()))
+    reader.start()
+    reader.join(timeout=5)
+    blocked = reader.is_alive()
+
+    release.set()
+    writer.join(timeout=30)
+    reader.join(timeout=30)
+
+    assert not blocked
+    assert results == [6]
+    assert collection.sum() == 60
+
+
+def test_snapshot_is_isolated():
+    collection = concurrent_dotlist(list(range(100)))
+    snapshot = collection.snapshot()
+
+    collection[0] = 'changed'
+    collection.add(100)
+    collection.flush()
+
+    assert snapshot.to_list() == list(range(100))
+    assert collection.count == 101
@@ -0,0 +1,85 @@
+import random
+
+from dotlist import PersistentStorage, dotlist
+
+
+def test_persistent_matches_list():
+    rng = random.Random(7)
+    storage, model = PersistentStorage(range(500)), list(range(500))
+
+    for step in range(3000):
+        operation = rng.random()
+        if operation < 0.3:
+            index = rng.randint(-len(model), len(model))
+            storage.insert(index, step)
+            model.insert(index, step)
+        elif operation < 0.5 and model:
+            index = rng.randrange(len(model))
+            del storage[index]
+            del model[index]
+        elif operation < 0.8 and model:
+            index = rng.randrange(-len(model), len(model))
+            storage[index] = step
+            model[index] = step
+        else:
+            storage.extend([step] * rng.randint(0, 40))
+            model.extend([step] * (len(storage) - len(model)))
+
+    assert list(storage) == model
+    assert [storage[x] for x in range(-len(model), len(model))] == model * 2
+
+
+def test_clone_keeps_old_version():
+    collection = dotlist(list(range(1000)), storage='persistent')
+    snapshot = collection.clone()
+
+    collection[10] = 'changed'
+    collection.insert('inserted', 500)
+    collection.remove(999)
+    collection.add('added')
+
+    assert isinstance(snapshot, dotlist)
+    assert snapshot.to_list() == list(range(1000))
+    assert collection.at(10) == 'changed'
+    assert collection.at(500) == 'inserted'
+    assert collection.count == 1001
+
+
+def test_clone_shares_structure():
+    storage = PersistentStorage(range(10000))
+    clone = storage.copy()
+
+    assert clone._root is storage._root
+    clone[0] = -1
+    assert clone._root.children[-1] is storage._root.children[-1]
+    assert storage[0] == 0
+
+
+def test_clone_of_list_storage():
+    collection = dotlist(['howdy', 'there'])
+    clone = collection.clone()
+    clone.add('world')
+
+    assert isinstance(clone, dotlist)
+    assert collection.to_list() == ['howdy', 'there']
+
+
+def test_diff_between_versions():
+    old = dotlist(list(range(5000)), storage='persistent')
+    new = old.clone()
+    new[1234] = 'world'
+    new.add(['again', 'again'])
+    new.remove(10)
+
+    added, removed = dotlist.diff(old, new)
+
+    assert sorted(added, key=str) == ['again', 'again', 'world']
+    assert sorted(removed) == [10, 1234]
+
+
+def test_diff_of_plain_collections():
+    added, removed = dotlist.diff(
+        dotlist(['howdy', 'there']), dotlist(['howdy', 'world']))
+
+    assert added.to_list() == ['world']
+    assert removed.to_list() == ['there']
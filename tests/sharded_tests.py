@@ -0,0 +1,155 @@
+import gc
+import multiprocessing
+from operator import add, itemgetter
+
+import pytest
+
+from dotlist import sharded_dotlist
+from dotlist.collections import DotListException
+
+
+def _even(x):
+    return x % 2 == 0
+
+
+def _square(x):
+    return x * x
+
+
+def _count(collection):
+    return collection.count
+
+
+def _fail(collection):
+    raise ValueError('shard failed')
+
+
+@pytest.fixture(params=['hash', 'range'])
+def numbers(request):
+    with sharded_dotlist(list(range(5000)), shards=3,
+                         partition=request.param) as collection:
+        yield collection
+
+
+def test_sharded_round_trip(numbers):
+    assert sorted(numbers.to_list()) == list(range(5000))
+    assert len(numbers) == numbers.count == 5000
+    assert sorted(numbers.collect()) == list(range(5000))
+
+
+def test_sharded_aggregates(numbers):
+    assert numbers.sum() == sum(range(5000))
+    assert numbers.min() == 0
+    assert numbers.max() == 4999
+    assert numbers.average() == sum(range(5000)) / 5000
+    assert numbers.is_numeric()
+    assert numbers.has(4321) and numbers.nas(5000)
+    assert numbers.map_reduce(_count, sum) == 5000
+
+
+def test_sharded_derived_collections(numbers):
+    evens = numbers.where(_even)
+    squares = evens.select(_square)
+
+    assert sorted(evens.to_list()) == list(range(0, 5000, 2))
+    assert squares.sum() == sum(x * x for x in range(0, 5000, 2))
+    assert numbers.skip(_even).count == 2500
+    assert numbers.select(_even).distinct().count == 2
+    assert numbers.select(_even).count_distinct() == 2
+
+
+def test_sharded_group_by(numbers):
+    groups = numbers.group_by(_even, _even, add)
+    assert groups == {True: 2500, False: 0}
+
+    lists = numbers.group_by(_even)
+    assert sorted(lists[True]) == list(range(0, 5000, 2))
+
+
+@pytest.mark.parametrize('partition', ['hash', 'range'])
+def test_sharded_records(partition):
+    records = [{'key': 'ab'[x % 2], 'value': x} for x in range(100)]
+
+    with sharded_dotlist(records, shards=2,
+                         partition=partition) as collection:
+        assert collection.count == 100
+        assert collection.has({'key': 'a', 'value': 0})
+        assert collection.group_by(
+            itemgetter('key'), itemgetter('value'), add) == {
+                'a': sum(range(0, 100, 2)), 'b': sum(range(1, 100, 2))}
+        assert collection.select(itemgetter('key')).count_distinct() == 2
+
+
+def test_sharded_mixed_types_fall_back_to_round_robin():
+    with sharded_dotlist([1, 'a', 2.5, [3]], shards=2,
+                         partition='range') as collection:
+        assert collection.count == 4
+        assert collection.has('a') and collection.has([3])
+
+
+def test_sharded_unpicklable_function_keeps_workers_in_step(numbers):
+    with pytest.raises(Exception):
+        numbers.where(lambda x: x > 10)
+
+    assert numbers.count == 5000
+    assert numbers.where(_even).count == 2500
+
+
+def test_sharded_partial_send_keeps_workers_in_step(numbers):
+    cluster = numbers._cluster
+    lengths = cluster.broadcast('call', numbers._key, '__len__', ())
+
+    with pytest.raises(Exception):
+        cluster.request([('call', (numbers._key, 'sum', ()))] + [
+            ('apply', (numbers._key, lambda x: 0, ()))] * 2)
+
+    assert cluster.broadcast('call', numbers._key, '__len__', ()) == lengths
+    assert numbers.has(10)
+
+
+def test_sharded_worker_errors_are_raised(numbers):
+    with pytest.raises(DotListException, match='shard failed'):
+        numbers.map_reduce(_fail, sum)
+
+    assert numbers.sum() == sum(range(5000))
+
+
+def test_sharded_derived_collections_are_dropped(numbers):
+    cluster = numbers._cluster
+    evens = numbers.where(_even)
+    key = evens._key
+
+    del evens
+    gc.collect()
+    numbers.count
+
+    with pytest.raises(DotListException):
+        cluster.broadcast('call', key, '__len__', ())
+
+
+def test_sharded_workers_stop_when_collected():
+    before = len(multiprocessing.active_children())
+
+    for _ in range(3):
+        collection = sharded_dotlist(range(10), shards=2)
+        evens = collection.where(_even)
+        del collection
+        assert sorted(evens.to_list()) == [0, 2, 4, 6, 8]
+        del evens
+    gc.collect()
+
+    assert len(multiprocessing.active_children()) == before
+
+
+def test_sharded_drop_and_close():
+    collection = sharded_dotlist([1, 2, 3], shards=2)
+    derived = collection.where(_even)
+
+    derived.drop()
+    derived.drop()
+    with pytest.raises(DotListException):
+        derived.count
+
+    collection.close()
+    with pytest.raises(DotListException):
+        collection.count
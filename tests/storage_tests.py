@@ -0,0 +1,271 @@
+from array import array
+
+import pytest
+
+from dotlist import (
+    AdaptiveStorage, CategoricalStorage, ColumnarStorage, dotlist)
+
+
+def test_categorical_round_trip():
+    values = ['gb', 'us', 'gb', 'fr', 'us', 'gb']
+    collection = dotlist(values, storage='categorical')
+
+    assert list(collection) == values
+    assert collection.to_list() == values
+    assert collection.count == 6
+    assert collection.count_distinct() == 3
+    assert sorted(collection.distinct()) == ['fr', 'gb', 'us']
+    assert collection.has(['gb', 'fr'])
+    assert collection.nas('de')
+
+
+def test_categorical_mutation():
+    collection = dotlist(['gb', 'us', 'gb'], storage='categorical')
+
+    collection[1] = 'fr'
+    collection.remove('gb')
+    collection.insert('de', 0)
+    collection.add('fr')
+
+    assert list(collection) == ['de', 'fr', 'gb', 'fr']
+    assert collection.count_distinct() == 3
+    assert collection.nas('us')
+    assert collection.join_left({'fr': 1}) == {'fr': 1, 'gb': None, 'de': None}
+
+
+def test_categorical_out_of_range_assignment():
+    collection = dotlist(['gb', 'us'], storage='categorical')
+
+    collection[10] = 'zz'
+
+    assert list(collection) == ['gb', 'us']
+    assert collection.nas('zz')
+    assert collection.count_distinct() == 2
+    assert 'zz' not in collection.distinct()
+
+
+def test_categorical_keeps_equal_values_of_different_types():
+    values = [1, True, 1.0, 0, False, 0.0, 1]
+    collection = dotlist(values, storage='categorical')
+    plain = dotlist(values)
+
+    assert collection.to_list() == values
+    assert [type(x) for x in collection] == [type(x) for x in values]
+    assert collection.has([True, 1.0, 0]) and collection.nas(2)
+    assert collection.count_distinct() == plain.count_distinct() == 2
+    assert collection._collection.count(1) == values.count(1) == 4
+    assert collection._collection.index(1.0, 2) == values.index(1.0, 2)
+
+    collection.remove(1.0)
+    values.remove(1.0)
+    assert collection.to_list() == values
+    assert [type(x) for x in collection] == [type(x) for x in values]
+
+    storage = CategoricalStorage([1.0, False, True, 0])
+    storage.sort()
+    assert [(type(x), x) for x in storage] == [
+        (bool, False), (int, 0), (float, 1.0), (bool, True)]
+
+
+def test_categorical_follows_element_order():
+    values = ['a', 'b', 'a']
+    collection = dotlist(values, storage='categorical')
+    plain = dotlist(values)
+
+    assert collection.to_dictionary(lambda x: 1, lambda x: x) == \
+        plain.to_dictionary(lambda x: 1, lambda x: x) == {1: 'a'}
+
+    collection = dotlist(['a', 'b'], storage='categorical')
+    collection.remove('a')
+    collection.add('a')
+    assert list(collection.join_left({'a': 1})) == ['b', 'a']
+    assert list(collection.join_inner({'a': 1, 'b': 2})) == ['b', 'a']
+
+def test_categorical_widens_codes():
+    storage = CategoricalStorage(str(x) for x in range(300))
+
+    assert storage.codes.typecode == 'H'
+    assert storage[299] == '299'
+    assert storage.count_distinct() == 300
+
+
+def test_categorical_slice_and_sort():
+    storage = CategoricalStorage(['c', 'a', 'b', 'a'])
+
+    assert list(storage[1:3]) == ['a', 'b']
+    storage.sort()
+    assert list(storage) == ['a', 'a', 'b', 'c']
+    storage.sort(reverse=True)
+    assert list(storage) == ['c', 'b', 'a', 'a']
+
+
+def _records():
+    return [{'name': f'user{x}', 'age': 20 + x % 50, 'score': x / 4,
+             'country': 'gb' if x % 3 else 'us'} for x in range(300)]
+
+
+def test_columnar_round_trip():
+    records = _records() + [{'name': 'extra', 'tag': 'new'}]
+    collection = dotlist.from_records(records)
+
+    assert collection.count == len(records)
+    assert list(collection) == records
+    assert collection.to_list() == records
+    assert collection.at(-1) == {'name': 'extra', 'tag': 'new'}
+    assert collection[10:12].to_list() == records[10:12]
+
+
+def test_columnar_columns_are_typed():
+    storage = ColumnarStorage(_records())
+
+    assert isinstance(storage._columns['age'], array)
+    assert isinstance(storage._columns['score'], array)
+    assert isinstance(storage._columns['country'], CategoricalStorage)
+
+
+def test_columnar_select_where_and_to_dictionary():
+    records = _records()
+    collection = dotlist.from_records(records)
+
+    assert collection.select(lambda r: r['age']).to_list() == [
+        x['age'] for x in records]
+    assert collection.select(lambda r: r['age'] * 2).to_list() == [
+        x['age'] * 2 for x in records]
+    assert collection.where(lambda r: r['country'] == 'us').to_list() == [
+        x for x in records if x['country'] == 'us']
+    assert collection.to_dictionary(
+        lambda r: r['name'], lambda r: r['score']) == {
+            x['name']: x['score'] for x in records}
+
+
+def test_columnar_projection_of_inspected_values():
+    collection = dotlist.from_records([{'a': 5, 'b': 1}, {'a': 0, 'b': 1}])
+
+    assert collection.select(lambda r: r['a'] or r['b']).to_list() == [5, 1]
+    assert collection.select(lambda r: r['a'] == 0).to_list() == [
+        False, True]
+    assert collection.to_dictionary(
+        lambda r: r['a'] or r['b'], lambda r: r['b']) == {5: 1, 1: 1}
+
+
+def test_columnar_mutation():
+    records = _records()[:5]
+    collection = dotlist.from_records(records)
+
+    collection.add({'name': 'new', 'age': 'unknown'})
+    collection.insert({'name': 'first'}, 0)
+    collection[1] = {'name': 'changed', 'age': 1.5}
+    collection.remove(records[2])
+    collection.shave_last()
+
+    expected = [{'name': 'first'}, {'name': 'changed', 'age': 1.5}]
+    expected += [records[1], records[3], records[4]]
+    assert collection.to_list() == expected
+
+
+def test_columnar_rows_without_fields():
+    collection = dotlist.from_records([{}, {}])
+
+    assert len(collection) == 2
+    assert list(collection) == [{}, {}]
+    assert collection.columns() == {}
+
+
+def test_columns():
+    records = [{'a': 1, 'b': 'x'}, {'a': 2}]
+
+    for collection in (dotlist.from_records(records), dotlist(records)):
+        columns = collection.columns()
+        assert list(columns) == ['a', 'b']
+        assert all(isinstance(x, dotlist) for x in columns.values())
+        assert columns['a'].to_list() == [1, 2]
+        assert columns['b'].to_list() == ['x', None]
+
+
+def _switches():
+    switches = list()
+    return switches, lambda *args: switches.append(args[:3])
+
+
+def test_adaptive_moves_queues_to_deque():
+    switches, hook = _switches()
+    storage = AdaptiveStorage(range(1000), on_switch=hook)
+    collection = dotlist(storage)
+
+    for x in range(2000):
+        collection.add(x)
+        collection.shave_first()
+
+    assert storage.backend == 'deque'
+    assert switches[0][:2] == ('list', 'deque')
+    assert collection.to_list() == list(range(1000, 2000))
+
+
+def test_adaptive_indexes_membership():
+    storage = AdaptiveStorage(range(100))
+    collection = dotlist(storage)
+
+    for x in range(2000):
+        assert collection.has(x % 200) == (x % 200 < 100)
+
+    assert storage.backend == 'list+index'
+    collection.remove(5)
+    collection[0] = 500
+    collection.add([5, 5])
+    assert collection.nas(0) and collection.has([5, 500])
+    assert storage.count(5) == 2
+    assert collection.to_list() == [500] + list(range(1, 5)) + \
+        list(range(6, 100)) + [5, 5]
+
+
+def test_adaptive_tallies_types_on_write():
+    storage = AdaptiveStorage([1, 2, 3])
+    collection = dotlist(storage)
+
+    assert collection.is_numeric() and storage._numeric_typecode() == 'q'
+    collection.add(1.5)
+    assert collection.is_numeric() and storage._numeric_typecode() is None
+    collection[1] = 'x'
+    assert not collection.is_numeric()
+    collection.remove('x')
+    collection.remove(1.5)
+    assert collection.is_numeric() and storage._numeric_typecode() == 'q'
+    collection[0:2] = ['a']
+    assert not collection.is_numeric()
+
+
+def test_adaptive_pinned_backend():
+    storage = AdaptiveStorage([1, 2, 3], backend='array')
+    collection = dotlist(storage)
+
+    for x in range(2000):
+        collection.has(x)
+    assert storage.backend == 'array'
+    assert isinstance(storage._backend, array)
+    assert collection.sum() == 6
+
+    collection.add(2 ** 70)
+    assert storage.backend == 'list'
+    assert collection.sum() == 6 + 2 ** 70
+
+    copied = storage.copy()
+    for x in range(2000):
+        assert (x in copied) == (x in (1, 2, 3))
+    assert copied.backend == storage.backend == 'list'
+
+    with pytest.raises(ValueError):
+        AdaptiveStorage(['x'], backend='array')
+    with pytest.raises(ValueError):
+        AdaptiveStorage([1], backend='tree')
+
+
+def test_columnar_widens_for_ints_outside_int64():
+    collection = dotlist.from_records([{'a': 1, 'b': 2}, {'a': 3, 'b': 4}])
+
+    collection.add({'a': 5, 'b': 2 ** 70})
+    collection.add({'a': 7, 'b': 8})
+    collection[0] = {'a': 9, 'b': -2 ** 70}
+
+    assert collection.to_list() == [
+        {'a': 9, 'b': -2 ** 70}, {'a': 3, 'b': 4}, {'a': 5, 'b': 2 ** 70},
+        {'a': 7, 'b': 8}]
@@ -0,0 +1,132 @@
+import gc
+import weakref
+
+import pytest
+
+from dotlist import concurrent_dotlist, dotlist, dotlist_view
+
+
+def _even(x):
+    return x % 2 == 0
+
+
+def _double(x):
+    return x * 2
+
+
+def _mutate(collection):
+    collection.add([5, 6, 7, 8])
+    collection.insert(10, 0)
+    collection.insert(11, -1)
+    collection.remove([3, 6])
+    collection[1] = 20
+    collection[-1] = 21
+    collection.shave_first()
+    collection.shave_last()
+
+
+def test_view_count_after_creation():
+    collection = dotlist([2, 4, 5])
+    evens = collection.view_where(_even)
+    doubled = collection.view_select(_double)
+
+    assert evens.count == 2
+    assert doubled.count == 3
+
+    collection.remove(7)
+    assert evens.count == 2
+    assert doubled.count == 3
+
+
+def test_where_view_is_patched():
+    collection = dotlist([1, 2, 3, 4])
+    view = collection.view_where(_even)
+    assert view.count == 2
+
+    _mutate(collection)
+
+    assert view.to_list() == collection.where(_even).to_list()
+    assert view.count == len(view.to_list())
+
+
+def test_select_view_is_patched():
+    collection = dotlist([1, 2, 3, 4])
+    view = collection.view_select(_double)
+
+    _mutate(collection)
+
+    assert view.to_list() == collection.select(_double).to_list()
+
+
+def test_view_is_rebuilt_on_reset():
+    collection = dotlist([4, 1, 3, 2])
+    view = collection.view_where(_even)
+
+    collection.sort()
+    assert view.to_list() == [2, 4]
+    collection.apply(lambda x: x + 1)
+    assert view.to_list() == [2, 4]
+
+
+def test_views_chain():
+    collection = dotlist([1, 2, 3, 4])
+    chained = collection.view_where(_even).view_select(_double)
+
+    collection.add([6, 7])
+    collection.remove(2)
+
+    assert chained.to_list() == [8, 12]
+
+
+def test_func_runs_once_per_added_element():
+    calls = list()
+    collection = dotlist([1, 2])
+    view = collection.view_select(lambda x: calls.append(x) or x)
+
+    collection.add(3)
+
+    assert calls == [1, 2, 3]
+    assert view.to_list() == [1, 2, 3]
+
+
+def test_detached_view_stops_following():
+    collection = dotlist([1, 2])
+    view = collection.view_where(_even)
+
+    view.detach()
+    collection.add(4)
+
+    assert not view.attached
+    assert view.to_list() == [2]
+    assert not collection._subscribers
+
+
+def test_unreferenced_view_is_released():
+    collection = dotlist([1, 2])
+    released = weakref.ref(collection.view_where(_even))
+    gc.collect()
+
+    assert released() is None
+    collection.add(4)
+    assert not collection._subscribers
+
+
+def test_views_are_read_only():
+    view = dotlist([1, 2]).view_where(_even)
+
+    with pytest.raises(Exception):
+        view.add(4)
+    with pytest.raises(TypeError):
+        dotlist_view(dotlist(), _even)
+
+
+def test_view_of_concurrent_collection():
+    collection = concurrent_dotlist([1, 2], batch_size=2)
+    collection.add(3)
+    view = collection.view_where(_even)
+
+    collection.add([4, 5, 6])
+    collection.flush()
+    collection.remove(2)
+
+    assert view.to_list() == [4, 6]